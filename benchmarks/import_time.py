@@ -0,0 +1,47 @@
+"""测量`import pyJianYingDraft`及首次访问延迟导入的元数据/控制器的耗时
+
+每次测量均在新的子进程中进行, 以排除模块缓存的影响
+
+用法: python benchmarks/import_time.py [重复次数]
+"""
+
+import os
+import sys
+import subprocess
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CASES = [
+    ("import pyJianYingDraft", ""),
+    ("+ Filter_type", "draft.Filter_type"),
+    ("+ Video_scene_effect_type", "draft.Video_scene_effect_type"),
+    ("+ 全部元数据", "[getattr(draft, name) for name in draft.__all__ if name.endswith(('_type', '_intro', '_outro', '_anim'))]"),
+    ("+ Jianying_controller", "draft.Jianying_controller"),
+]
+
+SNIPPET = """
+import time
+start = time.perf_counter()
+import pyJianYingDraft as draft
+{access}
+print(time.perf_counter() - start)
+"""
+
+def measure(access: str) -> float:
+    """在子进程中执行一次导入, 返回耗时(秒), 失败时抛出`subprocess.CalledProcessError`"""
+    output = subprocess.run([sys.executable, "-c", SNIPPET.format(access=access)], cwd=REPO_ROOT,
+                            check=True, capture_output=True, text=True).stdout
+    return float(output.strip().splitlines()[-1])
+
+def main() -> None:
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    for name, access in CASES:
+        try:
+            best = min(measure(access) for _ in range(repeat))
+        except subprocess.CalledProcessError as e:
+            print("%-28s 失败: %s" % (name, e.stderr.strip().splitlines()[-1]))
+            continue
+        print("%-28s %8.1f ms" % (name, best * 1e3))
+
+if __name__ == "__main__":
+    main()
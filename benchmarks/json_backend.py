@@ -0,0 +1,55 @@
+"""比较不同JSON后端加载及导出大型草稿的耗时
+
+用法: python -m benchmarks.json_backend [字幕片段数量]
+(在仓库根目录下执行, 或已安装pyJianYingDraft)
+"""
+
+import sys
+import time
+
+import pyJianYingDraft as draft
+from pyJianYingDraft import json_util
+
+def build_script(segment_count: int) -> draft.Script_file:
+    """构造一个包含大量文本片段和滤镜片段的草稿"""
+    script = draft.Script_file(1920, 1080)
+    script.add_track(draft.Track_type.text).add_track(draft.Track_type.filter)
+
+    style = draft.Text_style(size=5, align=1, color=(1.0, 1.0, 0.0))
+    for i in range(segment_count):
+        t_range = draft.Timerange(i * draft.SEC, draft.SEC)
+        script.add_segment(draft.Text_segment("第%d条字幕" % i, t_range, style=style,
+                                              clip_settings=draft.Clip_settings(transform_y=-0.8)))
+        if i % 10 == 0:
+            script.add_filter(draft.Filter_type.冰雪世界, draft.Timerange(i * draft.SEC, 10 * draft.SEC))
+    return script
+
+def timeit(func, repeat: int = 3) -> float:
+    """返回多次运行中的最短耗时, 单位为秒"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main() -> None:
+    segment_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    script = build_script(segment_count)
+    backends = ["json"] + (["orjson"] if json_util.orjson is not None else [])
+
+    outputs = {}
+    print("草稿包含 %d 个文本片段" % segment_count)
+    for backend in backends:
+        json_util.set_backend(backend)
+        outputs[backend] = script.dumps()
+        dump_time = timeit(script.dumps)
+        load_time = timeit(lambda: json_util.loads(outputs[backend]))
+        print("%-8s dumps: %7.3fs  loads: %7.3fs  (%.1f MB)" %
+              (backend, dump_time, load_time, len(outputs[backend].encode("utf-8")) / 2**20))
+
+    if len(outputs) > 1:
+        print("输出一致:", outputs["json"] == outputs["orjson"])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""测量常用值对象及片段的内存占用
+
+用法: python -m benchmarks.memory [片段数量]
+(在仓库根目录下执行, 或已安装pyJianYingDraft)
+"""
+
+import sys
+import tracemalloc
+
+from typing import Callable, List, Any
+
+import pyJianYingDraft as draft
+from pyJianYingDraft.keyframe import Keyframe
+from pyJianYingDraft.segment import Speed
+from pyJianYingDraft.metadata import Effect_param_instance
+
+def measure(factory: Callable[[int], Any], count: int) -> float:
+    """返回`factory`所构造的每个对象平均占用的内存, 单位为字节"""
+    objects: List[Any] = []
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for i in range(count):
+        objects.append(factory(i))
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / count
+
+def make_segment(i: int) -> draft.Sticker_segment:
+    """构造一个带有4个关键帧的贴纸片段"""
+    segment = draft.Sticker_segment("7226264888031284538", draft.Timerange(i * draft.SEC, draft.SEC),
+                                    clip_settings=draft.Clip_settings(transform_y=-0.8))
+    segment.add_keyframes(draft.Keyframe_property.position_x, [(0, 0.0), (draft.SEC, 0.5)])
+    segment.add_keyframes(draft.Keyframe_property.alpha, [(0, 0.0), (draft.SEC, 1.0)])
+    return segment
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    param = next(effect.value.params[0] for effect in draft.Video_scene_effect_type if effect.value.params)
+
+    cases = [
+        ("Timerange", lambda i: draft.Timerange(i, 1000)),
+        ("Keyframe", lambda i: Keyframe(i, 0.5)),
+        ("Speed", lambda i: Speed(1.0)),
+        ("Clip_settings", lambda i: draft.Clip_settings(transform_y=-0.8)),
+        ("Crop_settings", lambda i: draft.Crop_settings()),
+        ("Effect_param_instance", lambda i: Effect_param_instance(param, 0, 0.5)),
+        ("Sticker_segment(4个关键帧)", make_segment),
+    ]
+    print("%d 个对象的平均内存占用:" % count)
+    for name, factory in cases:
+        print("  %-26s %8.1f 字节" % (name, measure(factory, count)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""pyJianYingDraft的基准测试集, 覆盖片段添加、字幕导入、模板加载及导出、素材替换和元数据查找
+
+素材的元数据由合成的解析缓存提供, 无需真实的音视频文件, 可离线运行.
+结果可保存为JSON文件, 并可与此前保存的基线结果逐项比较, 有项目变慢超过阈值时以状态码1退出.
+
+用法: python -m benchmarks.suite [--quick] [--filter 关键字] [--repeat 次数] [--output 结果.json] [--compare 基线.json]
+(在仓库根目录下执行, 或已安装pyJianYingDraft)
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import statistics
+
+from typing import Callable, Dict, List, Tuple, Any
+
+import pyJianYingDraft as draft
+from pyJianYingDraft import json_util, Track_type, Timerange, SEC
+
+Setup = Callable[[], Callable[[], Any]]
+"""准备测试数据并返回待计时的函数, 准备过程不计入耗时"""
+
+class Synthetic_probe_cache:
+    """对任意路径均返回合成元数据的素材解析缓存, 用于代替真实的素材解析"""
+
+    def get(self, path: str, kind: str) -> Tuple[str, int, int, int]:
+        if kind == "audio":
+            return ("audio", 600 * SEC, 0, 0)
+        return ("video", 600 * SEC, 1920, 1080)
+
+    def put(self, path: str, kind: str, result: Tuple[str, int, int, int]) -> None:
+        pass
+
+class Workspace:
+    """存放占位素材文件及生成的字幕、模板文件的临时目录"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.video_path = self._placeholder("video.mp4")
+        self.audio_path = self._placeholder("audio.mp3")
+        self._files: Dict[str, str] = {}
+
+    def _placeholder(self, name: str) -> str:
+        path = os.path.join(self.path, name)
+        open(path, "wb").close()
+        return path
+
+    def srt(self, count: int) -> str:
+        """生成包含`count`条字幕的SRT文件"""
+        def tstamp(us: int) -> str:
+            ms = us // 1000
+            return "%02d:%02d:%02d,%03d" % (ms // 3600000, ms // 60000 % 60, ms // 1000 % 60, ms % 1000)
+
+        key = "srt%d" % count
+        if key not in self._files:
+            path = os.path.join(self.path, key + ".srt")
+            with open(path, "w", encoding="utf-8") as f:
+                for i in range(count):
+                    f.write("%d\n%s --> %s\n第%d条字幕\n第二行\n\n" % (i + 1, tstamp(i * SEC), tstamp(i * SEC + SEC // 2), i))
+            self._files[key] = path
+        return self._files[key]
+
+    def template(self, count: int) -> str:
+        """生成包含`count`个视频片段及`count`个文本片段的模板草稿文件"""
+        key = "template%d" % count
+        if key not in self._files:
+            script = draft.Script_file(1920, 1080)
+            script.add_track(Track_type.video).add_track(Track_type.text)
+            material = draft.Video_material(self.video_path)
+            for i in range(count):
+                script.add_segment(draft.Video_segment(material, Timerange(i * SEC, SEC)))
+                script.add_segment(draft.Text_segment("第%d条字幕" % i, Timerange(i * SEC, SEC)))
+            path = os.path.join(self.path, key + ".json")
+            script.dump(path)
+            self._files[key] = path
+        return self._files[key]
+
+def add_segment_case(ws: Workspace, track_type: str, count: int) -> Setup:
+    """向一条轨道中逐个添加`count`个片段, 片段的构造不计入耗时"""
+    def setup() -> Callable[[], Any]:
+        script = draft.Script_file(1920, 1080)
+        script.add_track(Track_type.from_name(track_type))
+        ranges = [Timerange(i * SEC, SEC) for i in range(count)]
+
+        if track_type == "effect":
+            effect = draft.Video_scene_effect_type.from_name("冲刺")
+            return lambda: [script.add_effect(effect, t_range) for t_range in ranges]
+        if track_type == "filter":
+            filter_meta = draft.Filter_type.from_name("冰雪世界")
+            return lambda: [script.add_filter(filter_meta, t_range) for t_range in ranges]
+
+        segments: List[Any]
+        if track_type == "video":
+            material = draft.Video_material(ws.video_path)
+            segments = [draft.Video_segment(material, t_range) for t_range in ranges]
+        elif track_type == "audio":
+            material = draft.Audio_material(ws.audio_path)
+            segments = [draft.Audio_segment(material, t_range) for t_range in ranges]
+        elif track_type == "text":
+            style = draft.Text_style(size=5, align=1)
+            segments = [draft.Text_segment("第%d条字幕" % i, t_range, style=style) for i, t_range in enumerate(ranges)]
+        else:
+            segments = [draft.Sticker_segment("7226264888031284538", t_range) for t_range in ranges]
+        return lambda: [script.add_segment(segment) for segment in segments]
+    return setup
+
+def import_srt_case(ws: Workspace, count: int) -> Setup:
+    def setup() -> Callable[[], Any]:
+        path = ws.srt(count)
+        script = draft.Script_file(1920, 1080)
+        return lambda: script.import_srt(path, "subtitle")
+    return setup
+
+def load_template_case(ws: Workspace, count: int) -> Setup:
+    def setup() -> Callable[[], Any]:
+        path = ws.template(count)
+        return lambda: draft.Script_file.load_template(path)
+    return setup
+
+def dumps_case(ws: Workspace, count: int) -> Setup:
+    def setup() -> Callable[[], Any]:
+        script = draft.Script_file.load_template(ws.template(count))
+        return script.dumps
+    return setup
+
+def replace_material_by_seg_case(ws: Workspace, count: int, edits: int = 100) -> Setup:
+    """在模板的视频轨道上均匀选取`edits`个片段替换素材并延长, 每次替换都会后移其后的所有片段"""
+    def setup() -> Callable[[], Any]:
+        script = draft.Script_file.load_template(ws.template(count))
+        track = script.get_imported_track(Track_type.video)
+        material = draft.Video_material(ws.video_path)
+        indices = range(0, count, max(1, count // edits))
+
+        def run() -> None:
+            for index in indices:
+                script.replace_material_by_seg(track, index, material, Timerange(0, 2 * SEC),
+                                               handle_extend=draft.Extend_mode.push_tail)
+        return run
+    return setup
+
+def from_name_case(count: int) -> Setup:
+    """在多个元数据枚举中按名称查找共`count`次"""
+    def setup() -> Callable[[], Any]:
+        enums = [draft.Font_type, draft.Filter_type, draft.Transition_type, draft.Video_scene_effect_type]
+        queries = [(enum, member.name) for enum in enums for member in enum]
+        queries = (queries * (count // len(queries) + 1))[:count]
+        return lambda: [enum.from_name(name) for enum, name in queries]
+    return setup
+
+def build_cases(ws: Workspace, quick: bool) -> List[Tuple[str, Setup]]:
+    segment_counts = [1000, 10000] if quick else [1000, 10000, 100000]
+    srt_counts = [10000] if quick else [10000, 100000]
+    template_counts = [5000] if quick else [5000, 50000]
+
+    cases: List[Tuple[str, Setup]] = []
+    for track_type in ["video", "audio", "text", "sticker", "effect", "filter"]:
+        for count in segment_counts:
+            cases.append(("add_segment/%s/%d" % (track_type, count), add_segment_case(ws, track_type, count)))
+    for count in srt_counts:
+        cases.append(("import_srt/%d" % count, import_srt_case(ws, count)))
+    for count in template_counts:
+        cases.append(("load_template/%d" % count, load_template_case(ws, count)))
+        cases.append(("dumps/%d" % count, dumps_case(ws, count)))
+        cases.append(("replace_material_by_seg/%d" % count, replace_material_by_seg_case(ws, count)))
+    cases.append(("from_name/100000", from_name_case(100000)))
+    return cases
+
+def run_case(setup: Setup, repeat: int) -> Dict[str, Any]:
+    """运行一个测试项`repeat`次, 每次均重新准备数据"""
+    timings: List[float] = []
+    for _ in range(repeat):
+        func = setup()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+        del func
+    return {"min": min(timings), "median": statistics.median(timings), "repeat": repeat}
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], threshold: float) -> bool:
+    """逐项比较最短耗时并输出, 返回是否有项目变慢超过`threshold`(相对值)"""
+    regressed = False
+    print("\n%-36s %10s %10s %8s" % ("与基线比较", "基线(s)", "当前(s)", "比值"))
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result["min"] / baseline[name]["min"]
+        flag = ""
+        if ratio > 1 + threshold:
+            flag, regressed = "  变慢", True
+        elif ratio < 1 - threshold:
+            flag = "  变快"
+        print("%-36s %10.4f %10.4f %8.2f%s" % (name, baseline[name]["min"], result["min"], ratio, flag))
+    return regressed
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="pyJianYingDraft基准测试")
+    parser.add_argument("--quick", action="store_true", help="只运行较小规模的测试项")
+    parser.add_argument("--filter", default="", help="只运行名称中包含此关键字的测试项")
+    parser.add_argument("--repeat", type=int, default=3, help="每个测试项的重复次数, 默认为3")
+    parser.add_argument("--output", help="将结果以JSON格式保存至此路径")
+    parser.add_argument("--compare", help="作为基线的此前保存的结果")
+    parser.add_argument("--threshold", type=float, default=0.1, help="判定为变慢的相对阈值, 默认为0.1")
+    args = parser.parse_args()
+
+    draft.set_probe_cache(Synthetic_probe_cache())  # type: ignore
+    results: Dict[str, Dict[str, Any]] = {}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        ws = Workspace(temp_dir)
+        for name, setup in build_cases(ws, args.quick):
+            if args.filter not in name:
+                continue
+            results[name] = run_case(setup, args.repeat)
+            print("%-36s min %9.4fs  median %9.4fs" % (name, results[name]["min"], results[name]["median"]), flush=True)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "json_backend": json_util.get_backend(),
+            "quick": args.quick,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=4)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
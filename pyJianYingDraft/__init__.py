@@ -1,4 +1,10 @@
+import importlib
+
+from typing import TYPE_CHECKING
+from typing import Dict, List, Any
+
 from .local_materials import Crop_settings, Video_material, Audio_material
+from .local_materials import Media_probe_cache, set_probe_cache, probe_materials
 from .keyframe import Keyframe_property
 
 from .time_util import Timerange
@@ -7,22 +13,58 @@ from .video_segment import Video_segment, Sticker_segment, Clip_settings
 from .effect_segment import Effect_segment, Filter_segment
 from .text_segment import Text_segment, Text_style, Text_border, Text_background
 
-from .metadata import Font_type
 from .metadata import Mask_type
-from .metadata import Transition_type, Filter_type
-from .metadata import Intro_type, Outro_type, Group_animation_type
-from .metadata import Text_intro, Text_outro, Text_loop_anim
-from .metadata import Audio_scene_effect_type, Tone_effect_type, Speech_to_song_type
-from .metadata import Video_scene_effect_type, Video_character_effect_type
 
 from .track import Track_type
 from .template_mode import Shrink_mode, Extend_mode
 from .script_file import Script_file
-from .draft_folder import Draft_folder
-from .jianying_controller import Jianying_controller, Export_resolution, Export_framerate
+from .draft_folder import Draft_folder, Draft_job, Draft_job_result
 
 from .time_util import SEC, tim, trange
 
+if TYPE_CHECKING:
+    from .metadata import Font_type
+    from .metadata import Transition_type, Filter_type
+    from .metadata import Intro_type, Outro_type, Group_animation_type
+    from .metadata import Text_intro, Text_outro, Text_loop_anim
+    from .metadata import Audio_scene_effect_type, Tone_effect_type, Speech_to_song_type
+    from .metadata import Video_scene_effect_type, Video_character_effect_type
+    from .jianying_controller import Jianying_controller, Export_resolution, Export_framerate
+    from .keyframe_curve import Keyframe_curve
+
+# 元数据枚举类、剪映控制器(依赖`uiautomation`, 仅支持Windows)及关键帧曲线(依赖NumPy)在首次访问时才导入
+# NumPy为可选依赖, 故`Keyframe_curve`不列入`__all__`, 以免`from pyJianYingDraft import *`在未安装NumPy时失败
+_LAZY_ATTRS: Dict[str, str] = {
+    "Font_type": ".metadata",
+    "Transition_type": ".metadata",
+    "Filter_type": ".metadata",
+    "Intro_type": ".metadata",
+    "Outro_type": ".metadata",
+    "Group_animation_type": ".metadata",
+    "Text_intro": ".metadata",
+    "Text_outro": ".metadata",
+    "Text_loop_anim": ".metadata",
+    "Audio_scene_effect_type": ".metadata",
+    "Tone_effect_type": ".metadata",
+    "Speech_to_song_type": ".metadata",
+    "Video_scene_effect_type": ".metadata",
+    "Video_character_effect_type": ".metadata",
+    "Jianying_controller": ".jianying_controller",
+    "Export_resolution": ".jianying_controller",
+    "Export_framerate": ".jianying_controller",
+    "Keyframe_curve": ".keyframe_curve",
+}
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_ATTRS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
+
 __all__ = [
     "Font_type",
     "Mask_type",
@@ -40,6 +82,9 @@ __all__ = [
     "Video_scene_effect_type",
     "Video_character_effect_type",
     "Crop_settings",
+    "Media_probe_cache",
+    "set_probe_cache",
+    "probe_materials",
     "Video_material",
     "Audio_material",
     "Keyframe_property",
@@ -59,6 +104,8 @@ __all__ = [
     "Extend_mode",
     "Script_file",
     "Draft_folder",
+    "Draft_job",
+    "Draft_job_result",
     "Jianying_controller",
     "Export_resolution",
     "Export_framerate",
@@ -1,15 +1,15 @@
 """定义视频/文本动画相关类"""
 
-import uuid
-
-from typing import Union, Optional
+from typing import Union, Optional, TYPE_CHECKING
 from typing import Literal, Dict, List, Any
 
+from . import id_util
 from .time_util import Timerange
 
-from .metadata.animation_meta import Animation_meta
-from .metadata import Intro_type, Outro_type, Group_animation_type
-from .metadata import Text_intro, Text_outro, Text_loop_anim
+if TYPE_CHECKING:
+    from .metadata.animation_meta import Animation_meta
+    from .metadata import Intro_type, Outro_type, Group_animation_type
+    from .metadata import Text_intro, Text_outro, Text_loop_anim
 
 class Animation:
     """一个视频/文本动画效果"""
@@ -31,7 +31,7 @@ class Animation:
     is_video_animation: bool
     """是否为视频动画, 在子类中定义"""
 
-    def __init__(self, animation_meta: Animation_meta, start: int, duration: int):
+    def __init__(self, animation_meta: "Animation_meta", start: int, duration: int):
         self.name = animation_meta.title
         self.effect_id = animation_meta.effect_id
         self.resource_id = animation_meta.resource_id
@@ -61,10 +61,11 @@ class Video_animation(Animation):
 
     animation_type: Literal["in", "out", "group"]
 
-    def __init__(self, animation_type: Union[Intro_type, Outro_type, Group_animation_type],
+    def __init__(self, animation_type: Union["Intro_type", "Outro_type", "Group_animation_type"],
                  start: int, duration: int):
         super().__init__(animation_type.value, start, duration)
 
+        from .metadata import Intro_type, Outro_type, Group_animation_type
         if isinstance(animation_type, Intro_type):
             self.animation_type = "in"
         elif isinstance(animation_type, Outro_type):
@@ -79,10 +80,11 @@ class Text_animation(Animation):
 
     animation_type: Literal["in", "out", "loop"]
 
-    def __init__(self, animation_type: Union[Text_intro, Text_outro, Text_loop_anim],
+    def __init__(self, animation_type: Union["Text_intro", "Text_outro", "Text_loop_anim"],
                  start: int, duration: int):
         super().__init__(animation_type.value, start, duration)
 
+        from .metadata import Text_intro, Text_outro, Text_loop_anim
         if isinstance(animation_type, Text_intro):
             self.animation_type = "in"
         elif isinstance(animation_type, Text_outro):
@@ -104,7 +106,7 @@ class Segment_animations:
     """动画列表"""
 
     def __init__(self):
-        self.animation_id = uuid.uuid4().hex
+        self.animation_id = id_util.new_id()
         self.animations = []
 
     def get_animation_trange(self, animation_type: Literal["in", "out", "group", "loop"]) -> Optional[Timerange]:
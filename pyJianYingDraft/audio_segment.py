@@ -3,19 +3,19 @@
 包含淡入淡出效果、音频特效等相关类
 """
 
-import uuid
-from copy import deepcopy
-
-from typing import Optional, Literal, Union
-from typing import Dict, List, Any
+from typing import Optional, Literal, Union, TYPE_CHECKING
+from typing import Dict, List, Tuple, Iterable, Any
 
+from . import id_util
+from . import profiling
 from .time_util import tim, Timerange
 from .segment import Media_segment
 from .local_materials import Audio_material
-from .keyframe import Keyframe_property, Keyframe_list
+from .keyframe import Keyframe_property
 
 from .metadata import Effect_param_instance
-from .metadata import Audio_scene_effect_type, Tone_effect_type, Speech_to_song_type
+if TYPE_CHECKING:
+    from .metadata import Audio_scene_effect_type, Tone_effect_type, Speech_to_song_type
 
 class Audio_fade:
     """音频淡入淡出效果"""
@@ -31,7 +31,7 @@ class Audio_fade:
     def __init__(self, in_duration: int, out_duration: int):
         """根据给定的淡入/淡出时长构造一个淡入淡出效果"""
 
-        self.fade_id = uuid.uuid4().hex
+        self.fade_id = id_util.new_id()
         self.in_duration = in_duration
         self.out_duration = out_duration
 
@@ -59,15 +59,16 @@ class Audio_effect:
 
     audio_adjust_params: List[Effect_param_instance]
 
-    def __init__(self, effect_meta: Union[Audio_scene_effect_type, Tone_effect_type, Speech_to_song_type],
+    def __init__(self, effect_meta: Union["Audio_scene_effect_type", "Tone_effect_type", "Speech_to_song_type"],
                  params: Optional[List[Optional[float]]] = None):
         """根据给定的音效元数据及参数列表构造一个音频特效对象, params的范围是0~100"""
 
         self.name = effect_meta.value.name
-        self.effect_id = uuid.uuid4().hex
+        self.effect_id = id_util.new_id()
         self.resource_id = effect_meta.value.resource_id
         self.audio_adjust_params = []
 
+        from .metadata import Audio_scene_effect_type, Tone_effect_type, Speech_to_song_type
         if isinstance(effect_meta, Audio_scene_effect_type):
             self.category_id = "sound_effect"
             self.category_name = "场景音"
@@ -103,7 +104,7 @@ class Audio_segment(Media_segment):
     """安放在轨道上的一个音频片段"""
 
     material_instance: Audio_material
-    """音频素材实例"""
+    """音频素材实例, 与其它使用同一素材的片段共享, 已被冻结"""
 
     fade: Optional[Audio_fade]
     """音频淡入淡出效果, 可能为空
@@ -117,6 +118,7 @@ class Audio_segment(Media_segment):
     在放入轨道时自动添加到素材列表中
     """
 
+    @profiling.timed
     def __init__(self, material: Audio_material, target_timerange: Timerange, *,
                  source_timerange: Optional[Timerange] = None, speed: Optional[float] = None, volume: float = 1.0):
         """利用给定的音频素材构建一个轨道片段, 并指定其时间信息及播放速度/音量
@@ -144,11 +146,11 @@ class Audio_segment(Media_segment):
 
         super().__init__(material.material_id, source_timerange, target_timerange, speed, volume)
 
-        self.material_instance = deepcopy(material)
+        self.material_instance = material.freeze()  # 各片段共享同一素材实例, 冻结以防被修改
         self.fade = None
         self.effects = []
 
-    def add_effect(self, effect_type: Union[Audio_scene_effect_type, Tone_effect_type, Speech_to_song_type],
+    def add_effect(self, effect_type: Union["Audio_scene_effect_type", "Tone_effect_type", "Speech_to_song_type"],
                    params: Optional[List[Optional[float]]] = None) -> "Audio_segment":
         """为音频片段添加一个作用于整个片段的音频效果, 目前“声音成曲”效果不能自动被剪映所识别
 
@@ -199,14 +201,16 @@ class Audio_segment(Media_segment):
             time_offset (`int`): 关键帧的时间偏移量, 单位为微秒
             volume (`float`): 音量在`time_offset`处的值
         """
-        _property = Keyframe_property.volume
-        for kf_list in self.common_keyframes:
-            if kf_list.keyframe_property == _property:
-                kf_list.add_keyframe(time_offset, volume)
-                return self
-        kf_list = Keyframe_list(_property)
-        kf_list.add_keyframe(time_offset, volume)
-        self.common_keyframes.append(kf_list)
+        self._get_keyframe_list(Keyframe_property.volume).add_keyframe(time_offset, volume)
+        return self
+
+    def add_keyframes(self, keyframes: Iterable[Tuple[int, float]]) -> "Audio_segment":
+        """为音频片段批量创建*控制音量*的关键帧, 结果与依次调用`add_keyframe`相同, 但在关键帧数量较多时快得多
+
+        Args:
+            keyframes (`Iterable[Tuple[int, float]]`): 一系列(时间偏移量, 音量)对, 时间偏移量单位为微秒
+        """
+        self._get_keyframe_list(Keyframe_property.volume).add_keyframes(keyframes)
         return self
 
     def export_json(self) -> Dict[str, Any]:
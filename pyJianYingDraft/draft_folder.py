@@ -2,11 +2,99 @@
 
 import os
 import shutil
+import traceback
+from dataclasses import dataclass, field
 
-from typing import List
+from typing import Optional, Union, Callable, Iterable, Dict, List, Set, Tuple, Any
 
+from .local_materials import Video_material, Audio_material
+from .template_mode import EditableTrack
+from .track import Track_type
 from .script_file import Script_file
 
+@dataclass
+class Draft_job:
+    """批量生成草稿时的一项任务, 描述要生成的新草稿以及在模板上进行的替换, 各项替换按字段顺序依次进行
+
+    任务会被传递给子进程, 故其中的内容须可被pickle
+    """
+
+    new_draft_name: str
+    """新草稿名称"""
+    material_replacements: Dict[str, Union[str, Video_material, Audio_material]] = field(default_factory=dict)
+    """按名称替换素材, 键为模板中的素材名称, 值为新素材或其路径
+
+    给出路径时, 若模板中有同名的视频素材则创建视频素材, 否则创建音频素材
+    """
+    text_replacements: List[Tuple[Union[str, int], int, Union[str, List[str]]]] = field(default_factory=list)
+    """替换文字, 每项为(文本轨道名称或下标, 片段下标, 新的文字内容), 参见`Script_file.replace_text`"""
+    track_imports: List[Tuple[str, str, Dict[str, Any]]] = field(default_factory=list)
+    """导入轨道, 每项为(源草稿名称, 轨道名称, `Script_file.import_track`的其它参数)"""
+
+@dataclass
+class Draft_job_result:
+    """批量生成草稿时单项任务的结果"""
+
+    new_draft_name: str
+    """新草稿名称"""
+    error: Optional[BaseException] = None
+    """任务失败时抛出的异常"""
+    traceback: Optional[str] = None
+    """任务失败时的调用栈信息"""
+
+    @property
+    def ok(self) -> bool:
+        """任务是否成功"""
+        return self.error is None
+
+_worker_state: Dict[str, Any] = {}
+"""批量生成草稿的子进程中的状态, 包括草稿文件夹、模板及已加载的源草稿"""
+
+def _init_worker(folder_path: str, template_name: str, allow_replace: bool) -> None:
+    folder = Draft_folder(folder_path)
+    _worker_state.update(folder=folder, template_name=template_name, allow_replace=allow_replace,
+                         template=folder.load_template(template_name), sources={})
+
+def _run_job(job: Draft_job) -> Draft_job_result:
+    """在子进程中执行一项任务, 任务中的异常均被捕获并记录在结果中"""
+    try:
+        folder: Draft_folder = _worker_state["folder"]
+        script: Script_file = _worker_state["template"].fork()
+
+        for material_name, material in job.material_replacements.items():
+            if isinstance(material, str):
+                is_video = any(mat.get("material_name") == material_name
+                               for mat in script.imported_materials.get("videos", []))
+                material = Video_material(material) if is_video else Audio_material(material)
+            script.replace_material_by_name(material_name, material)
+
+        texts_by_track: Dict[Union[str, int], Dict[int, Union[str, List[str]]]] = {}
+        for track_key, segment_index, text in job.text_replacements:
+            texts_by_track.setdefault(track_key, {})[segment_index] = text
+        for track_key, texts in texts_by_track.items():
+            if isinstance(track_key, str):
+                track = script.get_imported_track(Track_type.text, name=track_key)
+            else:
+                track = script.get_imported_track(Track_type.text, index=track_key)
+            script.replace_texts(track, texts)
+
+        sources: Dict[str, Script_file] = _worker_state["sources"]
+        for source_name, track_name, options in job.track_imports:
+            if source_name not in sources:
+                sources[source_name] = folder.load_template(source_name, lazy=True)  # 只需导入其中的个别轨道
+            source = sources[source_name]
+            source_tracks = [track for track in source.imported_tracks
+                             if isinstance(track, EditableTrack) and track.name == track_name]
+            if len(source_tracks) != 1:
+                raise ValueError("草稿 %s 中名为 '%s' 的可导入轨道有 %d 条" % (source_name, track_name, len(source_tracks)))
+            script.import_track(source, source_tracks[0], **options)
+
+        folder.save_as_draft(script, _worker_state["template_name"], job.new_draft_name,
+                             allow_replace=_worker_state["allow_replace"])
+        return Draft_job_result(job.new_draft_name)
+    except Exception as e:
+        return Draft_job_result(job.new_draft_name, e, traceback.format_exc())
+
 class Draft_folder:
     """管理一个文件夹及其内的一系列草稿"""
 
@@ -65,11 +153,12 @@ class Draft_folder:
         script_file = self.load_template(draft_name)
         script_file.inspect_material()
 
-    def load_template(self, draft_name: str) -> Script_file:
+    def load_template(self, draft_name: str, *, lazy: bool = False) -> Script_file:
         """在文件夹中打开一个草稿作为模板, 并在其上进行编辑
 
         Args:
             draft_name (`str`): 草稿名称, 即相应文件夹名称
+            lazy (`bool`, optional): 是否延迟加载, 参见`Script_file.load_template`. 默认为否.
 
         Returns:
             `Script_file`: 以模板模式打开的草稿对象
@@ -81,11 +170,13 @@ class Draft_folder:
         if not os.path.exists(draft_path):
             raise FileNotFoundError(f"草稿文件夹 {draft_name} 不存在")
 
-        return Script_file.load_template(os.path.join(draft_path, "draft_content.json"))
+        return Script_file.load_template(os.path.join(draft_path, "draft_content.json"), lazy=lazy)
 
     def duplicate_as_template(self, template_name: str, new_draft_name: str, allow_replace: bool = False) -> Script_file:
         """复制一份给定的草稿, 并在复制出的新草稿上进行编辑
 
+        如需由同一模板生成大量草稿, 可只加载一次模板, 再通过`Script_file.fork`及`save_as_draft`生成各草稿
+
         Args:
             template_name (`str`): 原草稿名称
             new_draft_name (`str`): 新草稿名称
@@ -110,3 +201,98 @@ class Draft_folder:
 
         # 打开草稿
         return self.load_template(new_draft_name)
+
+    def batch_generate(self, template_name: str, jobs: Iterable[Draft_job], *,
+                       workers: Optional[int] = None, max_pending: Optional[int] = None, allow_replace: bool = False,
+                       progress: Optional[Callable[[int, Draft_job_result], None]] = None) -> List[Draft_job_result]:
+        """以进程池并行地由同一模板批量生成草稿
+
+        每个子进程只加载一次模板, 此后对每项任务以`Script_file.fork`复制出新草稿, 进行替换后通过`save_as_draft`保存.
+        某项任务失败不会中止整个批次, 其异常记录在相应的结果中.
+        同一时刻至多有`max_pending`项任务已提交而未完成, 以限制内存占用.
+
+        Args:
+            template_name (`str`): 模板草稿名称
+            jobs (`Iterable[Draft_job]`): 各项任务, 开始执行前会被全部读出以检查新草稿名称
+            workers (`int`, optional): 子进程数, 默认为CPU核数
+            max_pending (`int`, optional): 最多同时提交的任务数, 默认为子进程数的2倍
+            allow_replace (`bool`, optional): 是否允许覆盖已存在的同名草稿. 默认为否, 此时相应任务失败.
+            progress (`Callable[[int, Draft_job_result], None]`, optional): 每完成一项任务时在当前进程中调用,
+                参数为已完成的任务数及该任务的结果
+
+        Returns:
+            `List[Draft_job_result]`: 与`jobs`一一对应的结果
+
+        Raises:
+            `FileNotFoundError`: 模板草稿不存在
+            `ValueError`: 多项任务的新草稿名称相同
+        """
+        if not os.path.exists(os.path.join(self.folder_path, template_name)):
+            raise FileNotFoundError(f"模板草稿 {template_name} 不存在")
+        jobs = list(jobs)
+        seen_names: Set[str] = set()
+        for job in jobs:
+            name_key = os.path.normcase(job.new_draft_name)
+            if name_key in seen_names:
+                raise ValueError(f"新草稿名称 {job.new_draft_name} 重复")
+            seen_names.add(name_key)
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if max_pending is None:
+            max_pending = 2 * workers
+
+        from concurrent.futures import Future, ProcessPoolExecutor, wait, FIRST_COMPLETED
+        results: Dict[int, Draft_job_result] = {}
+        with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                 initargs=(self.folder_path, template_name, allow_replace)) as executor:
+            pending: Dict[Future, Tuple[int, str]] = {}
+
+            def collect(done: Iterable[Future]) -> None:
+                for future in done:
+                    index, new_draft_name = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:  # 如子进程崩溃或结果无法pickle
+                        result = Draft_job_result(new_draft_name, e, traceback.format_exc())
+                    results[index] = result
+                    if progress is not None:
+                        progress(len(results), result)
+
+            for index, job in enumerate(jobs):
+                if len(pending) >= max_pending:
+                    collect(wait(pending, return_when=FIRST_COMPLETED).done)
+                pending[executor.submit(_run_job, job)] = (index, job.new_draft_name)
+            while pending:
+                collect(wait(pending, return_when=FIRST_COMPLETED).done)
+
+        return [results[index] for index in range(len(results))]
+
+    def save_as_draft(self, script: Script_file, template_name: str, new_draft_name: str, allow_replace: bool = False) -> None:
+        """将内存中的草稿(如由`Script_file.fork`得到的草稿)保存为文件夹中的新草稿, 草稿内容以外的文件复制自给定的模板草稿
+
+        此后该草稿对象的`save`方法将保存至新草稿中
+
+        Args:
+            script (`Script_file`): 要保存的草稿对象
+            template_name (`str`): 提供草稿内容以外文件(如封面、元数据等)的模板草稿名称
+            new_draft_name (`str`): 新草稿名称
+            allow_replace (`bool`, optional): 是否允许覆盖与`new_draft_name`重名的草稿. 默认为否.
+
+        Raises:
+            `FileNotFoundError`: 模板草稿不存在
+            `FileExistsError`: 已存在与`new_draft_name`重名的草稿, 但不允许覆盖.
+        """
+        template_path = os.path.join(self.folder_path, template_name)
+        new_draft_path = os.path.join(self.folder_path, new_draft_name)
+        if not os.path.exists(template_path):
+            raise FileNotFoundError(f"模板草稿 {template_name} 不存在")
+        if os.path.exists(new_draft_path) and not allow_replace:
+            raise FileExistsError(f"新草稿 {new_draft_name} 已存在且不允许覆盖")
+
+        # 草稿内容随后写入, 无需复制
+        shutil.copytree(template_path, new_draft_path, dirs_exist_ok=allow_replace,
+                        ignore=lambda path, names: ["draft_content.json"] if os.path.samefile(path, template_path) else [])
+
+        script.save_path = os.path.join(new_draft_path, "draft_content.json")
+        script.save(incremental=True)
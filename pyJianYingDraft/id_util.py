@@ -0,0 +1,76 @@
+"""草稿中各类对象id的生成, 默认使用随机的uuid4, 可替换为更快且可复现的生成器"""
+
+import uuid
+import hashlib
+import itertools
+from contextlib import contextmanager
+
+from typing import Callable, Iterator, Optional, Union
+
+Id_generator = Callable[[], str]
+"""id生成器, 每次调用返回一个新的id, 应为32位十六进制字符串"""
+
+def uuid4_id() -> str:
+    """默认的id生成器, 返回随机uuid4的十六进制形式"""
+    return uuid.uuid4().hex
+
+class Sequential_id_generator:
+    """按顺序生成id的生成器, 比uuid4快得多, 且相同种子下生成的id序列完全相同, 便于缓存及比较草稿内容
+
+    生成的id由种子的哈希值(前16位)及计数器(后16位)组成, 不同种子生成的id一般不会重复
+    """
+
+    prefix: str
+    """由种子得到的id前缀"""
+
+    def __init__(self, seed: Union[int, str] = 0):
+        """以给定的种子初始化生成器
+
+        Args:
+            seed (`int` or `str`, optional): 种子, 默认为0
+        """
+        self.prefix = hashlib.md5(str(seed).encode("utf-8")).hexdigest()[:16]
+        self._counter = itertools.count()
+
+    def __call__(self) -> str:
+        return "%s%016x" % (self.prefix, next(self._counter))
+
+    def reset(self) -> None:
+        """重置计数器, 此后将从头生成相同的id序列"""
+        self._counter = itertools.count()
+
+_generator: Id_generator = uuid4_id
+"""当前使用的id生成器"""
+
+def new_id() -> str:
+    """使用当前的id生成器生成一个新的id"""
+    return _generator()
+
+def get_id_generator() -> Id_generator:
+    """获取当前使用的id生成器"""
+    return _generator
+
+def set_id_generator(generator: Optional[Id_generator]) -> None:
+    """设置此后创建片段、轨道、关键帧、特效等对象时使用的id生成器
+
+    生成器为全局共享, 在多个线程中同时生成草稿时, 各线程得到的id序列不再可复现
+
+    Args:
+        generator (`Id_generator`, optional): 新的id生成器, 传入None则恢复为默认的uuid4
+    """
+    global _generator
+    _generator = uuid4_id if generator is None else generator
+
+@contextmanager
+def use_id_generator(generator: Id_generator) -> Iterator[Id_generator]:
+    """在`with`语句块内临时使用给定的id生成器, 退出时恢复原有的生成器
+
+    Args:
+        generator (`Id_generator`): 语句块内使用的id生成器
+    """
+    previous = _generator
+    set_id_generator(generator)
+    try:
+        yield generator
+    finally:
+        set_id_generator(previous)
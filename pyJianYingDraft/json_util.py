@@ -0,0 +1,286 @@
+"""JSON相关的辅助函数, 包括可替换的JSON编解码后端以及草稿文件的流式写入"""
+
+import re
+import json
+import math
+
+from collections.abc import Iterator
+from typing import Optional, Literal, Union, TextIO, List, Tuple, Any
+from . import profiling
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_backend: Literal["orjson", "json"] = "json" if orjson is None else "orjson"
+"""当前使用的JSON后端, 安装了orjson时默认使用orjson"""
+
+_POSITIVE_EXPONENT = re.compile(rb"e[0-9]+(?:[,\n]|$)")
+"""orjson输出中以科学计数法表示且指数为正的浮点数, 可能误报字符串中的内容, 此时退回标准库即可"""
+
+def get_backend() -> Literal["orjson", "json"]:
+    """获取当前使用的JSON后端"""
+    return _backend
+
+def set_backend(backend: Literal["orjson", "json"]) -> None:
+    """设置使用的JSON后端, 无论使用哪种后端, 编码结果都与标准库一致
+
+    Args:
+        backend (`orjson` or `json`): 后端名称, `json`表示标准库
+
+    Raises:
+        `ValueError`: 不支持的后端名称
+        `ImportError`: 指定的后端未安装
+    """
+    global _backend
+    if backend not in ("orjson", "json"):
+        raise ValueError("不支持的JSON后端 '%s'" % backend)
+    if backend == "orjson" and orjson is None:
+        raise ImportError("未安装orjson, 无法使用orjson作为JSON后端")
+    _backend = backend
+
+@profiling.timed
+def loads(s: Union[str, bytes]) -> Any:
+    """解析JSON字符串, 解析结果与`json.loads`一致"""
+    if _backend == "orjson":
+        try:
+            return orjson.loads(s)
+        except orjson.JSONDecodeError:
+            pass  # 交由标准库处理, 如超出64位的整数, 或给出与标准库一致的异常
+    return json.loads(s)
+
+def load(fp: TextIO) -> Any:
+    """从文件中读取并解析JSON, 解析结果与`json.load`一致"""
+    return loads(fp.read())
+
+@profiling.timed
+def dumps(obj: Any, *, indent: Optional[int] = None) -> str:
+    """将对象编码为JSON字符串, 结果与`json.dumps(obj, ensure_ascii=False, indent=indent)`逐字节一致
+
+    orjson仅用于带缩进的编码(标准库此时无法使用C加速), 遇到orjson不支持或表示方式可能不同的内容时自动退回标准库,
+    如NaN及无穷大, 以及仅orjson能够编码的类型(枚举、UUID、dataclass等), 此时由标准库给出一致的结果或异常.
+
+    Args:
+        obj (`Any`): 要编码的对象
+        indent (`int`, optional): 缩进空格数, 为None时不换行缩进. 默认为None.
+    """
+    if _backend == "orjson" and indent is not None and indent >= 0:
+        data = _orjson_dumps(obj, indent)
+        if data is not None:
+            return data.decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, indent=indent)
+
+def dumps_str(s: str) -> str:
+    """将字符串编码为JSON, 结果与`json.dumps(s, ensure_ascii=False)`一致, 但省去了每次创建编码器的开销"""
+    return json.encoder.encode_basestring(s)
+
+_PLAIN_SCALARS = frozenset((str, int, bool, type(None)))
+
+def encodes_identically(a: Any, b: Any) -> bool:
+    """判断两个对象的JSON编码结果是否必然相同
+
+    比`==`更严格: 区分`1`与`1.0`、`True`与`1`、`0.0`与`-0.0`, 并要求字典的键顺序一致. 含NaN时总是返回False
+    """
+    stack = [([a], [b])]
+    pop, push = stack.pop, stack.append
+    while stack:
+        x, y = pop()
+        if type(x) is dict:
+            if list(x) != list(y):
+                return False
+            pairs = zip(x.values(), y.values())
+        else:
+            pairs = zip(x, y)
+        for u, v in pairs:
+            u_type = type(u)
+            if u_type is not type(v):
+                return False
+            if u_type is dict or u_type is list or u_type is tuple:
+                if len(u) != len(v):
+                    return False
+                push((u, v))
+            elif u != v or (u_type is float and math.copysign(1, u) != math.copysign(1, v)):
+                return False
+    return True
+
+def _is_plain(obj: Any) -> bool:
+    """检查对象是否仅由dict、list、tuple及str、int、bool、None和有限浮点数(均不含子类)构成
+
+    仅对这些内容orjson与标准库的行为一致: orjson会将NaN及无穷大编码为`null`, 还能编码枚举、UUID等标准库拒绝的类型
+    """
+    stack = [obj]
+    pop, extend = stack.pop, stack.extend
+    while stack:
+        item = pop()
+        item_type = type(item)
+        if item_type in _PLAIN_SCALARS:
+            continue
+        if item_type is dict:
+            extend(item.values())
+        elif item_type is list or item_type is tuple:
+            extend(item)
+        elif item_type is float:
+            if item - item != 0:  # NaN及无穷大
+                return False
+        else:
+            return False
+    return True
+
+def _orjson_dumps(obj: Any, indent: int) -> Optional[bytes]:
+    """利用orjson进行带缩进的编码, 若无法保证与标准库的结果一致则返回None"""
+    try:
+        data: bytes = orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATACLASS
+                                   | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_SUBCLASS)
+    except TypeError:
+        return None
+
+    # 标准库对绝对值小于1e-4或不小于1e16的浮点数使用科学计数法, orjson的表示方式与之不同
+    if b"e-" in data or b"0.0000" in data or _POSITIVE_EXPONENT.search(data):
+        return None
+    if not _is_plain(obj):
+        return None
+
+    if indent != 2:
+        # 每层缩进均为两个空格, 若字符串内没有连续空格, 则可直接替换所有的连续两个空格
+        indent_pairs, level = 0, 1
+        while True:
+            line_count = data.count(b"\n" + b"  " * level)
+            if line_count == 0:
+                break
+            indent_pairs += line_count
+            level += 1
+        if data.count(b"  ") != indent_pairs:
+            return None
+        data = data.replace(b"  ", b" " * indent)
+    return data
+
+class Encoded_json:
+    """预先编码好的JSON片段, `dump_stream`会将其原样写入(必要时调整缩进), 用于复用未发生变化部分的编码结果"""
+
+    __slots__ = ("text", "indent", "level")
+
+    text: str
+    """编码结果"""
+    indent: Optional[int]
+    """编码时使用的缩进空格数, 须与写入时一致"""
+    level: int
+    """编码结果所处的层级, 与写入时的层级一致时无需调整缩进"""
+
+    def __init__(self, text: str, indent: Optional[int], level: int = 0):
+        self.text = text
+        self.indent = indent
+        self.level = level
+
+    @classmethod
+    def encode(cls, obj: Any, indent: Optional[int], level: int = 0) -> "Encoded_json":
+        """以给定的缩进编码对象, 编码结果位于第`level`层"""
+        text = dumps(obj, indent=indent)
+        if indent is not None and level > 0:
+            text = text.replace("\n", "\n" + " " * (indent * level))
+        return cls(text, indent, level)
+
+def split_indented(text: str, indent: int, level: int = 0) -> Optional[List[Tuple[Optional[str], str]]]:
+    """拆分以`indent`缩进编码、位于第`level`层的JSON数组或对象, 得到其各个直接子元素的编码结果
+
+    仅依赖换行及缩进确定子元素的边界(字符串中的换行符总会被转义), 故远快于完整解析,
+    子元素的编码结果保持原有缩进, 即位于第`level + 1`层. 格式不符时返回None.
+
+    Returns:
+        `List[Tuple[Optional[str], str]]`: 各子元素的键(数组元素为None)及编码结果
+    """
+    end = len(text)
+    while end > 0 and text[end - 1].isspace():  # 避免复制整个字符串
+        end -= 1
+    if end == 2 and text[:2] in ("[]", "{}"):
+        return []
+    is_dict = text.startswith("{")
+    closing = "\n" + " " * (indent * level) + ("}" if is_dict else "]")
+    child_prefix = "\n" + " " * (indent * (level + 1))
+    end -= len(closing)
+    if not (is_dict or text.startswith("[")) or not text.startswith(closing, end) or not text.startswith(child_prefix, 1):
+        return None
+
+    pattern = re.compile(re.escape(child_prefix) + r"(?![ \]}])")
+    starts = [m.start() for m in pattern.finditer(text, 1, end)]
+    if not starts or starts[0] != 1:
+        return None
+    starts.append(end + 1)  # 虚拟的下一个子元素, 使最后一个子元素的结尾可统一处理
+    decoder = json.JSONDecoder()
+    result: List[Tuple[Optional[str], str]] = []
+    for i in range(len(starts) - 1):
+        child_start, child_end = starts[i] + len(child_prefix), starts[i + 1] - 1
+        if child_end < end and text[child_end] != ",":
+            return None
+        key: Optional[str] = None
+        if is_dict:
+            try:
+                key, child_start = decoder.raw_decode(text, child_start)
+            except ValueError:
+                return None
+            if not isinstance(key, str) or not text.startswith(": ", child_start):
+                return None
+            child_start += 2
+        result.append((key, text[child_start:child_end]))
+    return result
+
+def _needs_stream(obj: Any) -> bool:
+    """判断对象中是否包含需要流式导出的迭代器或预先编码的片段, 只向下检查字典"""
+    if isinstance(obj, (Iterator, Encoded_json)):
+        return True
+    if isinstance(obj, dict):
+        return any(_needs_stream(value) for value in obj.values())
+    return False
+
+@profiling.timed
+def dump_stream(obj: Any, fp: TextIO, *, indent: Optional[int] = None) -> None:
+    """将对象以JSON格式流式写入文件, 输出与`json.dumps(obj, ensure_ascii=False, indent=indent)`完全一致
+
+    对象中的迭代器(如生成器)会被视为JSON数组, 逐个取出元素并写入, 故无需在内存中同时保存完整的JSON结构.
+    `Encoded_json`片段直接写入其编码结果, 不含迭代器的部分则一次性编码写入.
+
+    Args:
+        obj (`Any`): 要写入的对象, 迭代器及`Encoded_json`只允许作为字典的值或迭代器的元素出现
+        fp (`TextIO`): 以文本模式打开的文件对象
+        indent (`int`, optional): 缩进空格数, 为None时不换行缩进. 默认为None.
+    """
+    _write_value(obj, fp, indent, 0)
+
+def _write_value(obj: Any, fp: TextIO, indent: Optional[int], level: int) -> None:
+    if isinstance(obj, Encoded_json):
+        if obj.indent != indent:
+            raise ValueError("预先编码的JSON片段的缩进(%s)与写入时的缩进(%s)不一致" % (obj.indent, indent))
+        text = obj.text
+        if indent is not None and level != obj.level:
+            text = text.replace("\n" + " " * (indent * obj.level), "\n" + " " * (indent * level))
+        fp.write(text)
+        return
+    if not _needs_stream(obj):
+        text = dumps(obj, indent=indent)
+        if indent is not None and level > 0:
+            text = text.replace("\n", "\n" + " " * (indent * level))  # 字符串中的换行符已被转义, 不受影响
+        fp.write(text)
+        return
+
+    is_dict = isinstance(obj, dict)
+    opening, closing = ("{", "}") if is_dict else ("[", "]")
+    item_separator = "," if indent is not None else ", "
+    item_indent = "" if indent is None else "\n" + " " * (indent * (level + 1))
+
+    empty = True
+    for item in (obj.items() if is_dict else obj):
+        fp.write(opening if empty else item_separator)
+        fp.write(item_indent)
+        empty = False
+
+        if is_dict:
+            key, item = item
+            fp.write(json.dumps(key, ensure_ascii=False) + ": ")
+        _write_value(item, fp, indent, level + 1)
+
+    if empty:
+        fp.write(opening + closing)
+        return
+    if indent is not None:
+        fp.write("\n" + " " * (indent * level))
+    fp.write(closing)
@@ -1,11 +1,13 @@
-import uuid
-
 from enum import Enum
-from typing import Dict, List, Any
+from typing import Dict, List, Tuple, Iterable, Any
+
+from . import id_util
 
 class Keyframe:
     """一个关键帧（关键点）, 目前只支持线性插值"""
 
+    __slots__ = ("kf_id", "time_offset", "values")
+
     kf_id: str
     """关键帧全局id, 自动生成"""
     time_offset: int
@@ -15,7 +17,7 @@ class Keyframe:
 
     def __init__(self, time_offset: int, value: float):
         """给定时间偏移量及关键值, 初始化关键帧"""
-        self.kf_id = uuid.uuid4().hex
+        self.kf_id = id_util.new_id()
 
         self.time_offset = time_offset
         self.values = [value]
@@ -67,6 +69,8 @@ class Keyframe_list:
 
     list_id: str
     """关键帧列表全局id, 自动生成"""
+    _version: int
+    """修改计数, 每次通过方法添加关键帧时加一, 供片段的导出缓存判断内容是否变化"""
     keyframe_property: Keyframe_property
     """关键帧对应的属性"""
     keyframes: List[Keyframe]
@@ -74,16 +78,46 @@ class Keyframe_list:
 
     def __init__(self, keyframe_property: Keyframe_property):
         """为给定的关键帧属性初始化关键帧列表"""
-        self.list_id = uuid.uuid4().hex
+        self.list_id = id_util.new_id()
 
         self.keyframe_property = keyframe_property
+        self._version = 0
         self.keyframes = []
 
     def add_keyframe(self, time_offset: int, value: float):
         """给定时间偏移量及关键值, 向此关键帧列表中添加一个关键帧"""
         keyframe = Keyframe(time_offset, value)
-        self.keyframes.append(keyframe)
-        self.keyframes.sort(key=lambda x: x.time_offset)
+        self.keyframes.insert(self._bisect_keyframe(time_offset), keyframe)
+        self._version += 1
+
+    def add_keyframes(self, keyframes: Iterable[Tuple[int, float]]):
+        """批量添加关键帧, 结果与依次调用`add_keyframe`相同, 但只需排序一次
+
+        Args:
+            keyframes (`Iterable[Tuple[int, float]]`): 一系列(时间偏移量, 关键值)对
+        """
+        self._version += 1
+        start = len(self.keyframes)
+        self.keyframes.extend(Keyframe(time_offset, value) for time_offset, value in keyframes)
+        # 新关键帧整体按时间顺序排列于末尾时无需排序
+        for i in range(max(start, 1), len(self.keyframes)):
+            if self.keyframes[i - 1].time_offset > self.keyframes[i].time_offset:
+                self.keyframes.sort(key=lambda x: x.time_offset)  # 稳定排序, 时间相同的关键帧保持添加顺序
+                break
+
+    def _bisect_keyframe(self, time_offset: int) -> int:
+        """二分查找给定时间偏移量的关键帧在`keyframes`中的插入位置(置于时间相同的关键帧之后)"""
+        lo, hi = 0, len(self.keyframes)
+        # 大部分情况下关键帧按时间顺序添加, 直接置于末尾
+        if hi == 0 or self.keyframes[-1].time_offset <= time_offset:
+            return hi
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if time_offset < self.keyframes[mid].time_offset:
+                hi = mid
+            else:
+                lo = mid + 1
+        return lo
 
     def export_json(self) -> Dict[str, Any]:
         return {
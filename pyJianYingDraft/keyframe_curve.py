@@ -0,0 +1,170 @@
+"""以NumPy数组存储的关键帧曲线, 支持插值求值、按帧率重采样以及在给定误差内精简关键帧
+
+本模块依赖NumPy, 可通过`pip install pyJianYingDraft[numpy]`安装
+"""
+
+import math
+
+from typing import Optional, Union, Iterable, List, Tuple
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError("使用Keyframe_curve需要安装NumPy, 请执行 pip install pyJianYingDraft[numpy]") from e
+
+from .keyframe import Keyframe, Keyframe_list, Keyframe_property
+
+class Keyframe_curve(Keyframe_list):
+    """以NumPy数组存储时间偏移量及关键值的关键帧列表, 导出结果与同样内容的`Keyframe_list`一致
+
+    适用于由跟踪数据等逐帧生成的大量关键帧, 可先通过`simplify`精简后再加入片段中
+    """
+
+    time_offsets: np.ndarray
+    """各关键帧的时间偏移量(int64), 单位为微秒, 按升序排列"""
+    values: np.ndarray
+    """各关键帧的值(float64), 与`time_offsets`一一对应"""
+
+    _keyframes: Optional[List[Keyframe]]
+    """按需生成的关键帧对象, 曲线被修改后失效"""
+
+    def __init__(self, keyframe_property: Keyframe_property,
+                 time_offsets: Iterable[int] = (), values: Iterable[float] = ()):
+        """以给定的时间偏移量及关键值初始化关键帧曲线, 二者无需预先排序
+
+        Args:
+            keyframe_property (`Keyframe_property`): 关键帧对应的属性
+            time_offsets (`Iterable[int]`, optional): 各关键帧的时间偏移量, 单位为微秒
+            values (`Iterable[float]`, optional): 各关键帧的值
+
+        Raises:
+            `ValueError`: 时间偏移量与关键值的数量不一致
+        """
+        super().__init__(keyframe_property)
+        self._set_arrays(np.asarray(time_offsets, dtype=np.int64), np.asarray(values, dtype=np.float64))
+
+    @classmethod
+    def from_keyframe_list(cls, kf_list: Keyframe_list) -> "Keyframe_curve":
+        """由普通的关键帧列表构造关键帧曲线, 沿用其属性及列表id"""
+        curve = cls(kf_list.keyframe_property,
+                    [kf.time_offset for kf in kf_list.keyframes], [kf.values[0] for kf in kf_list.keyframes])
+        curve.list_id = kf_list.list_id
+        return curve
+
+    def _set_arrays(self, time_offsets: np.ndarray, values: np.ndarray) -> None:
+        if time_offsets.shape != values.shape or time_offsets.ndim != 1:
+            raise ValueError("时间偏移量与关键值应为长度相同的一维序列")
+        order = np.argsort(time_offsets, kind="stable")  # 时间相同的关键帧保持添加顺序
+        self.time_offsets = time_offsets[order]
+        self.values = values[order]
+        self._keyframes = None
+        self._version += 1
+
+    @property
+    def keyframes(self) -> List[Keyframe]:  # type: ignore[override]
+        """由曲线生成的关键帧对象, 仅供读取, 修改曲线应使用`add_keyframe(s)`"""
+        if self._keyframes is None:
+            self._keyframes = [Keyframe(int(t), float(v)) for t, v in zip(self.time_offsets, self.values)]
+        return self._keyframes
+    @keyframes.setter
+    def keyframes(self, keyframes: List[Keyframe]) -> None:
+        self._set_arrays(np.array([kf.time_offset for kf in keyframes], dtype=np.int64),
+                         np.array([kf.values[0] for kf in keyframes], dtype=np.float64))
+
+    def __len__(self) -> int:
+        return len(self.time_offsets)
+
+    def add_keyframe(self, time_offset: int, value: float):
+        """给定时间偏移量及关键值, 向曲线中添加一个关键帧"""
+        index = int(np.searchsorted(self.time_offsets, time_offset, side="right"))
+        self.time_offsets = np.insert(self.time_offsets, index, time_offset)
+        self.values = np.insert(self.values, index, value)
+        self._keyframes = None
+        self._version += 1
+
+    def add_keyframes(self, keyframes: Iterable[Tuple[int, float]]):
+        """批量添加关键帧
+
+        Args:
+            keyframes (`Iterable[Tuple[int, float]]`): 一系列(时间偏移量, 关键值)对
+        """
+        pairs = list(keyframes)
+        if not pairs:
+            return
+        time_offsets, values = zip(*pairs)
+        self._set_arrays(np.concatenate([self.time_offsets, np.asarray(time_offsets, dtype=np.int64)]),
+                         np.concatenate([self.values, np.asarray(values, dtype=np.float64)]))
+
+    def evaluate(self, time_offsets: Union[int, Iterable[int], np.ndarray]) -> Union[float, np.ndarray]:
+        """以线性插值计算曲线在给定时刻的值, 早于首个或晚于末个关键帧的时刻取端点值
+
+        Args:
+            time_offsets (`int` or `array_like`): 待求值的时间偏移量, 单位为微秒
+
+        Raises:
+            `ValueError`: 曲线中没有关键帧
+        """
+        if len(self) == 0:
+            raise ValueError("关键帧曲线为空, 无法求值")
+        result = np.interp(np.asarray(time_offsets, dtype=np.float64), self.time_offsets, self.values)
+        return float(result) if np.ndim(result) == 0 else result
+
+    def resample(self, fps: float, start: Optional[int] = None, end: Optional[int] = None) -> "Keyframe_curve":
+        """在给定帧率的每一帧处对曲线采样, 返回新的关键帧曲线
+
+        Args:
+            fps (`float`): 帧率, 通常为草稿的`fps`
+            start (`int`, optional): 采样起始时刻, 默认为首个关键帧的时刻
+            end (`int`, optional): 采样结束时刻(含), 默认为末个关键帧的时刻
+
+        Raises:
+            `ValueError`: 曲线中没有关键帧或帧率不为正数
+        """
+        if len(self) == 0:
+            raise ValueError("关键帧曲线为空, 无法重采样")
+        if fps <= 0:
+            raise ValueError("帧率应为正数")
+        start = int(self.time_offsets[0]) if start is None else start
+        end = int(self.time_offsets[-1]) if end is None else end
+
+        frame_duration = 1e6 / fps
+        frames = np.arange(math.ceil(start / frame_duration - 1e-9), math.floor(end / frame_duration + 1e-9) + 1)
+        time_offsets = np.round(frames * frame_duration).astype(np.int64)
+        return Keyframe_curve(self.keyframe_property, time_offsets, self.evaluate(time_offsets))
+
+    def simplify(self, tolerance: float) -> "Keyframe_curve":
+        """以Ramer-Douglas-Peucker算法精简关键帧, 返回新的关键帧曲线
+
+        精简后曲线在原有各关键帧时刻处的值与原值之差均不超过`tolerance`, 首末两个关键帧总会被保留
+
+        Args:
+            tolerance (`float`): 允许的最大误差, 与关键值的单位相同
+
+        Raises:
+            `ValueError`: `tolerance`为负数
+        """
+        if tolerance < 0:
+            raise ValueError("误差容限不能为负数")
+        n = len(self)
+        keep = np.zeros(n, dtype=bool)
+        if n:
+            keep[0] = keep[-1] = True
+
+        t = self.time_offsets.astype(np.float64)
+        v = self.values
+        stack = [(0, n - 1)] if n > 2 else []
+        while stack:
+            lo, hi = stack.pop()
+            if hi - lo < 2:
+                continue
+            span = t[hi] - t[lo]
+            ratio = (t[lo + 1:hi] - t[lo]) / span if span > 0 else np.zeros(hi - lo - 1)
+            error = np.abs(v[lo + 1:hi] - (v[lo] + (v[hi] - v[lo]) * ratio))
+            worst = int(np.argmax(error))
+            if error[worst] > tolerance:
+                mid = lo + 1 + worst
+                keep[mid] = True
+                stack.append((lo, mid))
+                stack.append((mid, hi))
+
+        return Keyframe_curve(self.keyframe_property, self.time_offsets[keep], self.values[keep])
@@ -1,13 +1,335 @@
 import os
 import uuid
+import sqlite3
+import threading
+import itertools
+import functools
 import pymediainfo
+from copy import deepcopy
 
-from typing import Optional, Literal
-from typing import Dict, Any
+from typing import Optional, Literal, Union, overload
+from typing import Dict, Tuple, List, Iterable, Callable, Any
 
-class Crop_settings:
+from . import util
+from . import profiling
+
+Probe_result = Tuple[Literal["video", "photo", "audio"], int, int, int]
+"""素材文件的解析结果: (素材类型, 时长, 宽度, 高度), 时长单位为微秒, 音频素材的宽高记为0"""
+
+class Media_probe_cache:
+    """素材解析结果的持久化缓存, 以SQLite数据库存储
+
+    以素材文件的绝对路径为键, 并记录文件大小及修改时间, 文件发生变化时缓存自动失效.
+    通过`set_probe_cache`启用后, `Video_material`及`Audio_material`的构造函数会优先查询缓存, 避免重复解析同一素材文件.
+    """
+
+    db_path: str
+    """数据库文件路径"""
+
+    _conn: Optional[sqlite3.Connection]
+    _lock: threading.Lock
+    _pid: int
+    """创建连接及锁的进程号, 用于识别fork出的子进程"""
+
+    def __init__(self, db_path: str):
+        """打开(或创建)位于指定路径的缓存数据库
+
+        Args:
+            db_path (`str`): 数据库文件路径, 传入`:memory:`则仅在内存中缓存
+        """
+        self.db_path = db_path
+        self._conn = None
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+        with self._get_lock():
+            self._connect()
+
+    def _get_lock(self) -> threading.Lock:
+        """获取保护数据库连接的锁
+
+        在fork出的子进程中, 继承自父进程的连接不可继续使用, 锁也可能处于被持有的状态, 故丢弃二者并重新创建
+        """
+        if self._pid != os.getpid():
+            self._conn = None  # 不关闭, 以免影响父进程仍在使用的连接
+            self._lock = threading.Lock()
+            self._pid = os.getpid()
+        return self._lock
+
+    def _connect(self) -> sqlite3.Connection:
+        self._get_lock()
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS probe_cache ("
+                "path TEXT NOT NULL, kind TEXT NOT NULL, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, "
+                "material_type TEXT NOT NULL, duration INTEGER NOT NULL, width INTEGER NOT NULL, height INTEGER NOT NULL, "
+                "PRIMARY KEY (path, kind))")
+        return self._conn
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """数据库连接不可序列化, 在其它进程中使用时重新连接"""
+        return {"db_path": self.db_path}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.db_path = state["db_path"]
+        self._conn = None
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def get(self, path: str, kind: Literal["video", "audio"]) -> Optional[Probe_result]:
+        """查询素材文件的解析结果, 文件不存在、未缓存或已发生变化时返回None
+
+        Args:
+            path (`str`): 素材文件路径
+            kind (`video` or `audio`): 素材是作为视频(图片)还是作为音频解析的
+        """
+        path = os.path.abspath(path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        with self._get_lock():
+            row = self._connect().execute(
+                "SELECT material_type, duration, width, height FROM probe_cache "
+                "WHERE path = ? AND kind = ? AND size = ? AND mtime_ns = ?",
+                (path, kind, stat.st_size, stat.st_mtime_ns)).fetchone()
+        return None if row is None else tuple(row)  # type: ignore
+
+    def put(self, path: str, kind: Literal["video", "audio"], result: Probe_result) -> None:
+        """记录素材文件的解析结果, 覆盖原有的记录
+
+        Args:
+            path (`str`): 素材文件路径
+            kind (`video` or `audio`): 素材是作为视频(图片)还是作为音频解析的
+            result (`Probe_result`): 解析结果
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        with self._get_lock():
+            self._connect().execute("INSERT OR REPLACE INTO probe_cache VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                    (path, kind, stat.st_size, stat.st_mtime_ns) + tuple(result))
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        """清除指定素材文件的缓存, 不指定路径则清除全部缓存
+
+        Args:
+            path (`str`, optional): 素材文件路径, 若为文件夹则清除其下所有文件的缓存
+        """
+        with self._get_lock():
+            if path is None:
+                self._connect().execute("DELETE FROM probe_cache")
+                return
+            path = os.path.abspath(path)
+            self._connect().execute("DELETE FROM probe_cache WHERE path = ? OR substr(path, 1, ?) = ?",
+                                    (path, len(path) + 1, os.path.join(path, "")))
+
+    def prune(self) -> int:
+        """清除所有已失效(文件被删除或修改)的缓存, 返回清除的条目数"""
+        with self._get_lock():
+            rows = self._connect().execute("SELECT path, kind, size, mtime_ns FROM probe_cache").fetchall()
+        stale = []
+        for path, kind, size, mtime_ns in rows:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                stale.append((path, kind))
+                continue
+            if (stat.st_size, stat.st_mtime_ns) != (size, mtime_ns):
+                stale.append((path, kind))
+        with self._get_lock():
+            self._connect().executemany("DELETE FROM probe_cache WHERE path = ? AND kind = ?", stale)
+        return len(stale)
+
+    def prewarm(self, directory: str, recursive: bool = True) -> int:
+        """解析文件夹下的所有素材文件并加入缓存, 已缓存且未变化的文件将被跳过, 无法解析的文件将被忽略
+
+        每个文件依次尝试作为视频(图片)及音频素材解析, 返回新加入缓存的条目数
+
+        Args:
+            directory (`str`): 素材文件夹路径
+            recursive (`bool`, optional): 是否包含子文件夹中的文件, 默认为是.
+
+        Raises:
+            `FileNotFoundError`: 文件夹不存在
+        """
+        if not os.path.isdir(directory):
+            raise FileNotFoundError(f"找不到文件夹 {directory}")
+
+        count = 0
+        for root, dirs, files in os.walk(os.path.abspath(directory)):
+            if not recursive:
+                dirs.clear()
+            for file_name in files:
+                path = os.path.join(root, file_name)
+                if self.get(path, "video") is not None or self.get(path, "audio") is not None:
+                    continue
+                # 损坏或无关的文件可能引发各种异常(如缺少时长信息时的TypeError), 均视为无法解析
+                try:
+                    self.put(path, "video", _probe_video(path, use_cache=False))
+                    count += 1
+                except Exception:
+                    try:
+                        self.put(path, "audio", _probe_audio(path, use_cache=False))
+                        count += 1
+                    except Exception:
+                        pass
+        return count
+
+_probe_cache: Optional[Media_probe_cache] = None
+"""当前使用的素材解析缓存, 为None时不使用缓存"""
+
+def set_probe_cache(cache: Optional[Media_probe_cache]) -> None:
+    """设置`Video_material`及`Audio_material`构造时使用的素材解析缓存
+
+    Args:
+        cache (`Media_probe_cache`, optional): 缓存对象, 传入None则停用缓存
+    """
+    global _probe_cache
+    _probe_cache = cache
+
+@profiling.timed
+def _probe_video(path: str, use_cache: bool = True) -> Probe_result:
+    """解析视频(或图片)素材的类型、时长及宽高, 优先查询缓存
+
+    Raises:
+        `ValueError`: 不支持的素材文件类型.
+    """
+    if use_cache and _probe_cache is not None:
+        cached = _probe_cache.get(path, "video")
+        if cached is not None:
+            return cached
+
+    postfix = os.path.splitext(path)[1]
+    if not pymediainfo.MediaInfo.can_parse():
+        raise ValueError(f"不支持的视频素材类型 '{postfix}'")
+
+    info: pymediainfo.MediaInfo = \
+        pymediainfo.MediaInfo.parse(path, mediainfo_options={"File_TestContinuousFileNames": "0"})  # type: ignore
+    result: Probe_result
+    # 有视频轨道的视为视频素材
+    if len(info.video_tracks):
+        result = ("video", int(info.video_tracks[0].duration * 1e3),  # type: ignore
+                  info.video_tracks[0].width, info.video_tracks[0].height)  # type: ignore
+    # gif文件使用imageio库获取长度
+    elif postfix.lower() == ".gif":
+        import imageio
+        gif = imageio.get_reader(path)
+
+        result = ("video", int(round(gif.get_meta_data()['duration'] * gif.get_length() * 1e3)),
+                  info.image_tracks[0].width, info.image_tracks[0].height)  # type: ignore
+        gif.close()
+    elif len(info.image_tracks):
+        result = ("photo", 10800000000,  # 相当于3h
+                  info.image_tracks[0].width, info.image_tracks[0].height)  # type: ignore
+    else:
+        raise ValueError(f"输入的素材文件 {path} 没有视频轨道或图片轨道")
+
+    if use_cache and _probe_cache is not None:
+        _probe_cache.put(path, "video", result)
+    return result
+
+@profiling.timed
+def _probe_audio(path: str, use_cache: bool = True) -> Probe_result:
+    """解析音频素材的时长, 优先查询缓存
+
+    Raises:
+        `ValueError`: 不支持的素材文件类型.
+    """
+    if use_cache and _probe_cache is not None:
+        cached = _probe_cache.get(path, "audio")
+        if cached is not None:
+            return cached
+
+    if not pymediainfo.MediaInfo.can_parse():
+        raise ValueError("不支持的音频素材类型 %s" % os.path.splitext(path)[1])
+    info: pymediainfo.MediaInfo = pymediainfo.MediaInfo.parse(path)  # type: ignore
+    if len(info.video_tracks):
+        raise ValueError("音频素材不应包含视频轨道")
+    if not len(info.audio_tracks):
+        raise ValueError(f"给定的素材文件 {path} 没有音频轨道")
+    result: Probe_result = ("audio", int(info.audio_tracks[0].duration * 1e3), 0, 0)  # type: ignore
+
+    if use_cache and _probe_cache is not None:
+        _probe_cache.put(path, "audio", result)
+    return result
+
+class _Freezable:
+    """可被冻结的对象, 冻结后不能再修改其属性, 用于在多个片段间安全地共享同一素材实例
+
+    冻结状态(及冻结后缓存的导出结果)不会被`copy.copy`及`copy.deepcopy`复制, 故可通过复制得到可修改的副本
+    """
+
+    __slots__ = ("_frozen", "_json_cache")
+
+    def freeze(self):
+        """冻结此对象, 此后修改其属性将引发`AttributeError`, 返回自身"""
+        if not self.frozen:
+            object.__setattr__(self, "_json_cache", None)
+            object.__setattr__(self, "_frozen", True)
+        return self
+
+    @property
+    def frozen(self) -> bool:
+        """是否已被冻结"""
+        return getattr(self, "_frozen", False)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if getattr(self, "_frozen", False):
+            raise AttributeError(f"{type(self).__name__}已被冻结(通常是因为已被片段引用), 不能修改其属性 '{name}', "
+                                 "请通过copy.copy或copy.deepcopy创建副本后再修改")
+        object.__setattr__(self, name, value)
+
+    def _attr_items(self) -> List[Tuple[str, Any]]:
+        """返回除冻结状态外的全部属性"""
+        items = list(getattr(self, "__dict__", {}).items())
+        for cls in type(self).__mro__:
+            for name in cls.__dict__.get("__slots__", ()):
+                if name not in _Freezable.__slots__ and hasattr(self, name):
+                    items.append((name, getattr(self, name)))
+        return items
+
+    def __copy__(self):
+        new_obj = type(self).__new__(type(self))
+        for name, value in self._attr_items():
+            object.__setattr__(new_obj, name, value)
+        return new_obj
+
+    def __deepcopy__(self, memo: Dict[int, Any]):
+        new_obj = type(self).__new__(type(self))
+        memo[id(self)] = new_obj
+        for name, value in self._attr_items():
+            object.__setattr__(new_obj, name, deepcopy(value, memo))
+        return new_obj
+
+    def __setstate__(self, state: Any) -> None:
+        """反序列化时绕过冻结检查, 状态格式与默认的`__reduce_ex__`一致"""
+        dict_state, slot_state = state if isinstance(state, tuple) else (state, None)
+        for name, value in itertools.chain((dict_state or {}).items(), (slot_state or {}).items()):
+            object.__setattr__(self, name, value)
+
+def _cache_when_frozen(export_json: Callable[[Any], Dict[str, Any]]) -> Callable[[Any], Dict[str, Any]]:
+    """装饰`_Freezable`子类的`export_json`方法, 对象冻结后只导出一次, 此后直接返回缓存的结果(不应修改)"""
+    @functools.wraps(export_json)
+    def wrapper(self: _Freezable) -> Dict[str, Any]:
+        if not self.frozen:
+            return export_json(self)
+        cached = getattr(self, "_json_cache", None)
+        if cached is not None:
+            util.export_cache_stats.hits += 1
+            return cached
+        util.export_cache_stats.misses += 1
+        cached = export_json(self)
+        object.__setattr__(self, "_json_cache", cached)
+        return cached
+    return wrapper
+
+class Crop_settings(_Freezable):
     """素材的裁剪设置, 各属性均在0-1之间, 注意素材的坐标原点在左上角"""
 
+    __slots__ = ("upper_left_x", "upper_left_y", "upper_right_x", "upper_right_y",
+                 "lower_left_x", "lower_left_y", "lower_right_x", "lower_right_y")
+
     upper_left_x: float
     upper_left_y: float
     upper_right_x: float
@@ -43,8 +365,11 @@ class Crop_settings:
             "lower_right_y": self.lower_right_y
         }
 
-class Video_material:
-    """本地视频素材（视频或图片）, 一份素材可以在多个片段中使用"""
+class Video_material(_Freezable):
+    """本地视频素材（视频或图片）, 一份素材可以在多个片段中使用
+
+    素材被用于创建片段时会被冻结(连同其裁剪设置), 各片段共享同一实例, 此后不能再修改其属性
+    """
 
     material_id: str
     """素材全局id, 自动生成"""
@@ -65,7 +390,8 @@ class Video_material:
     material_type: Literal["video", "photo"]
     """素材类型: 视频或图片"""
 
-    def __init__(self, path: str, material_name: Optional[str] = None, crop_settings: Crop_settings = Crop_settings()):
+    @profiling.timed
+    def __init__(self, path: str, material_name: Optional[str] = None, crop_settings: Optional[Crop_settings] = None):
         """从指定位置加载视频（或图片）素材
 
         Args:
@@ -78,42 +404,24 @@ class Video_material:
             `ValueError`: 不支持的素材文件类型.
         """
         path = os.path.abspath(path)
-        postfix = os.path.splitext(path)[1]
         if not os.path.exists(path):
             raise FileNotFoundError(f"找不到 {path}")
 
         self.material_name = material_name if material_name else os.path.basename(path)
         self.material_id = uuid.uuid3(uuid.NAMESPACE_DNS, self.material_name).hex
         self.path = path
-        self.crop_settings = crop_settings
+        self.crop_settings = Crop_settings() if crop_settings is None else crop_settings
         self.local_material_id = ""
 
-        if not pymediainfo.MediaInfo.can_parse():
-            raise ValueError(f"不支持的视频素材类型 '{postfix}'")
-
-        info: pymediainfo.MediaInfo = \
-            pymediainfo.MediaInfo.parse(path, mediainfo_options={"File_TestContinuousFileNames": "0"})  # type: ignore
-        # 有视频轨道的视为视频素材
-        if len(info.video_tracks):
-            self.material_type = "video"
-            self.duration = int(info.video_tracks[0].duration * 1e3)  # type: ignore
-            self.width, self.height = info.video_tracks[0].width, info.video_tracks[0].height  # type: ignore
-        # gif文件使用imageio库获取长度
-        elif postfix.lower() == ".gif":
-            import imageio
-            gif = imageio.get_reader(path)
-
-            self.material_type = "video"
-            self.duration = int(round(gif.get_meta_data()['duration'] * gif.get_length() * 1e3))
-            self.width, self.height = info.image_tracks[0].width, info.image_tracks[0].height  # type: ignore
-            gif.close()
-        elif len(info.image_tracks):
-            self.material_type = "photo"
-            self.duration = 10800000000  # 相当于3h
-            self.width, self.height = info.image_tracks[0].width, info.image_tracks[0].height  # type: ignore
-        else:
-            raise ValueError(f"输入的素材文件 {path} 没有视频轨道或图片轨道")
+        material_type, self.duration, self.width, self.height = _probe_video(path)
+        self.material_type = material_type  # type: ignore
 
+    def freeze(self) -> "Video_material":
+        """冻结此素材及其裁剪设置, 返回自身"""
+        self.crop_settings.freeze()
+        return super().freeze()
+
+    @_cache_when_frozen
     def export_json(self) -> Dict[str, Any]:
         video_material_json = {
             "audio_fade": None,
@@ -136,8 +444,11 @@ class Video_material:
         }
         return video_material_json
 
-class Audio_material:
-    """本地音频素材"""
+class Audio_material(_Freezable):
+    """本地音频素材
+
+    素材被用于创建片段时会被冻结, 各片段共享同一实例, 此后不能再修改其属性
+    """
 
     material_id: str
     """素材全局id, 自动生成"""
@@ -149,6 +460,7 @@ class Audio_material:
     duration: int
     """素材时长, 单位为微秒"""
 
+    @profiling.timed
     def __init__(self, path: str, material_name: Optional[str] = None):
         """从指定位置加载音频素材, 注意视频文件不应该作为音频素材使用
 
@@ -168,15 +480,9 @@ class Audio_material:
         self.material_id = uuid.uuid3(uuid.NAMESPACE_DNS, self.material_name).hex
         self.path = path
 
-        if not pymediainfo.MediaInfo.can_parse():
-            raise ValueError("不支持的音频素材类型 %s" % os.path.splitext(path)[1])
-        info: pymediainfo.MediaInfo = pymediainfo.MediaInfo.parse(path)  # type: ignore
-        if len(info.video_tracks):
-            raise ValueError("音频素材不应包含视频轨道")
-        if not len(info.audio_tracks):
-            raise ValueError(f"给定的素材文件 {path} 没有音频轨道")
-        self.duration = int(info.audio_tracks[0].duration * 1e3)  # type: ignore
+        self.duration = _probe_audio(path)[1]
 
+    @_cache_when_frozen
     def export_json(self) -> Dict[str, Any]:
         return {
             "app_id": 0,
@@ -217,3 +523,50 @@ class Audio_material:
             "video_id": "",
             "wave_points": []
         }
+
+def _create_material(material_type: Literal["video", "audio"], path: str) -> Union[Video_material, Audio_material]:
+    if material_type == "video":
+        return Video_material(path)
+    return Audio_material(path)
+
+@overload
+def probe_materials(paths: Iterable[str], material_type: Literal["video"] = ..., *,
+                    workers: Optional[int] = None, use_processes: bool = False) -> List[Union[Video_material, Exception]]: ...
+@overload
+def probe_materials(paths: Iterable[str], material_type: Literal["audio"], *,
+                    workers: Optional[int] = None, use_processes: bool = False) -> List[Union[Audio_material, Exception]]: ...
+
+def probe_materials(paths: Iterable[str], material_type: Literal["video", "audio"] = "video", *,
+                    workers: Optional[int] = None, use_processes: bool = False) -> List[Any]:
+    """并发地解析一批素材文件并创建相应的素材对象
+
+    返回的列表与输入路径一一对应, 某个文件解析失败时, 其对应位置为所抛出的异常对象, 而不会中止整个批次
+
+    Args:
+        paths (`Iterable[str]`): 素材文件路径
+        material_type (`video` or `audio`, optional): 创建视频(图片)素材还是音频素材, 默认为视频素材
+        workers (`int`, optional): 并发数, 默认由`concurrent.futures`决定
+        use_processes (`bool`, optional): 是否使用进程池而非线程池, 默认为否.
+            使用进程池时, spawn方式启动的子进程不会沿用当前进程通过`set_probe_cache`设置的缓存;
+            fork方式启动的子进程会重新连接至同一数据库文件, 但以`:memory:`创建的缓存在子进程中为空
+
+    Raises:
+        `ValueError`: 未知的素材类型
+    """
+    if material_type not in ("video", "audio"):
+        raise ValueError(f"未知的素材类型 '{material_type}'")
+    paths = list(paths)
+    if not paths:
+        return []
+
+    from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+    executor: Executor = ProcessPoolExecutor(workers) if use_processes else ThreadPoolExecutor(workers)
+    with executor:
+        futures = [executor.submit(_create_material, material_type, path) for path in paths]
+        results: List[Any] = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(e)
+    return results
@@ -1,15 +1,52 @@
-"""记录各种特效/音效/滤镜等的元数据"""
+"""记录各种特效/音效/滤镜等的元数据
 
-from .effect_meta import Effect_meta, Effect_param_instance
+除蒙版外, 各元数据枚举类均在首次访问时才导入相应模块, 以加快`import pyJianYingDraft`的速度
+"""
+
+import importlib
 
-from .font_meta import Font_type
+from typing import TYPE_CHECKING
+from typing import Dict, List, Any
+
+from .effect_meta import Effect_meta, Effect_param_instance
 from .mask_meta import Mask_type, Mask_meta
-from .filter_meta import Filter_type
-from .transition_meta import Transition_type
-from .animation_meta import Intro_type, Outro_type, Group_animation_type
-from .animation_meta import Text_intro, Text_outro, Text_loop_anim
-from .audio_effect_meta import Audio_scene_effect_type, Tone_effect_type, Speech_to_song_type
-from .video_effect_meta import Video_scene_effect_type, Video_character_effect_type
+
+if TYPE_CHECKING:
+    from .font_meta import Font_type
+    from .filter_meta import Filter_type
+    from .transition_meta import Transition_type
+    from .animation_meta import Intro_type, Outro_type, Group_animation_type
+    from .animation_meta import Text_intro, Text_outro, Text_loop_anim
+    from .audio_effect_meta import Audio_scene_effect_type, Tone_effect_type, Speech_to_song_type
+    from .video_effect_meta import Video_scene_effect_type, Video_character_effect_type
+
+_LAZY_ATTRS: Dict[str, str] = {
+    "Font_type": "font_meta",
+    "Filter_type": "filter_meta",
+    "Transition_type": "transition_meta",
+    "Intro_type": "animation_meta",
+    "Outro_type": "animation_meta",
+    "Group_animation_type": "animation_meta",
+    "Text_intro": "animation_meta",
+    "Text_outro": "animation_meta",
+    "Text_loop_anim": "animation_meta",
+    "Audio_scene_effect_type": "audio_effect_meta",
+    "Tone_effect_type": "audio_effect_meta",
+    "Speech_to_song_type": "audio_effect_meta",
+    "Video_scene_effect_type": "video_effect_meta",
+    "Video_character_effect_type": "video_effect_meta",
+}
+"""延迟导入的属性名 -> 所在的子模块名"""
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_ATTRS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module("." + _LAZY_ATTRS[name], __name__), name)
+    globals()[name] = value  # 缓存结果, 此后不再经过__getattr__
+    return value
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
 
 __all__ = [
     "Effect_meta",
@@ -1,11 +1,15 @@
+import bisect
+import difflib
 from enum import Enum
 
-from typing import List, Dict, Any
+from typing import List, Dict, Iterable, Any
 from typing import TypeVar, Optional
 
 class Effect_param:
     """特效参数信息"""
 
+    __slots__ = ("name", "default_value", "min_value", "max_value")
+
     name: str
     """参数名称"""
     default_value: float
@@ -24,6 +28,8 @@ class Effect_param:
 class Effect_param_instance(Effect_param):
     """特效参数实例"""
 
+    __slots__ = ("index", "value")
+
     index: int
     """参数索引"""
     value: float
@@ -89,8 +95,44 @@ class Effect_meta:
 
 Effect_enum_subclass = TypeVar("Effect_enum_subclass", bound="Effect_enum")
 
+def _normalize_name(name: str) -> str:
+    """名称的规范化形式: 转为小写并去除空格和下划线"""
+    return name.lower().replace(" ", "").replace("_", "")
+
+class _Name_index:
+    """特效枚举类的名称索引, 以规范化后的名称为键"""
+
+    by_name: Dict[str, "Effect_enum"]
+    """规范化名称 -> 枚举成员"""
+    sorted_names: List[str]
+    """排序后的规范化名称, 用于前缀查找"""
+
+    def __init__(self, enum_cls: "type[Effect_enum]"):
+        self.by_name = {}
+        for effect in enum_cls:
+            self.by_name.setdefault(_normalize_name(effect.name), effect)  # 与逐个比较时一样, 名称冲突时取靠前者
+        self.sorted_names = sorted(self.by_name)
+
+    def prefixed(self, prefix: str) -> List[str]:
+        """返回以给定前缀开头的所有规范化名称"""
+        start = bisect.bisect_left(self.sorted_names, prefix)
+        end = start
+        while end < len(self.sorted_names) and self.sorted_names[end].startswith(prefix):
+            end += 1
+        return self.sorted_names[start:end]
+
+_name_indices: Dict[type, _Name_index] = {}
+"""各特效枚举类的名称索引, 在首次查询时建立"""
+
 class Effect_enum(Enum):
-    """特效枚举基类, 提供一个`from_name`方法用于根据名称获取特效元数据"""
+    """特效枚举基类, 提供`from_name`等方法用于根据名称获取特效元数据"""
+
+    @classmethod
+    def _name_index(cls) -> _Name_index:
+        index = _name_indices.get(cls)
+        if index is None:
+            index = _name_indices[cls] = _Name_index(cls)
+        return index
 
     @classmethod
     def from_name(cls: "type[Effect_enum_subclass]", name: str) -> Effect_enum_subclass:
@@ -102,8 +144,61 @@ class Effect_enum(Enum):
         Raises:
             `ValueError`: 特效名称不存在
         """
-        name = name.lower().replace(" ", "").replace("_", "")
-        for effect in cls:
-            if effect.name.lower().replace(" ", "").replace("_", "") == name:
-                return effect
-        raise ValueError(f"Effect named '{name}' not found")
+        name = _normalize_name(name)
+        effect = cls._name_index().by_name.get(name)
+        if effect is None:
+            raise ValueError(f"Effect named '{name}' not found")
+        return effect  # type: ignore
+
+    @classmethod
+    def from_names(cls: "type[Effect_enum_subclass]", names: Iterable[str]) -> List[Effect_enum_subclass]:
+        """批量根据名称获取特效元数据, 名称匹配规则同`from_name`, 返回结果与输入一一对应
+
+        Args:
+            names (`Iterable[str]`): 特效名称
+
+        Raises:
+            `ValueError`: 存在不存在的特效名称, 异常信息中会列出所有不存在的名称
+        """
+        by_name = cls._name_index().by_name
+        ret: List[Effect_enum_subclass] = []
+        missing: List[str] = []
+        for name in names:
+            effect = by_name.get(_normalize_name(name))
+            if effect is None:
+                missing.append(name)
+            else:
+                ret.append(effect)  # type: ignore
+        if missing:
+            raise ValueError("Effects named %s not found" % ", ".join(f"'{name}'" for name in missing))
+        return ret
+
+    @classmethod
+    def search(cls: "type[Effect_enum_subclass]", query: str, *, limit: Optional[int] = 10,
+               fuzzy: bool = True, cutoff: float = 0.6) -> List[Effect_enum_subclass]:
+        """根据名称搜索特效元数据, 忽略大小写、空格和下划线
+
+        首先返回名称完全匹配的成员, 然后是以`query`开头的成员(按名称排序), 最后是名称相近的成员(按相似度排序)
+
+        Args:
+            query (`str`): 搜索的名称或名称前缀
+            limit (`int`, optional): 最多返回的结果数, 为None时不限制, 默认为10
+            fuzzy (`bool`, optional): 是否在前缀匹配之外进行模糊匹配, 默认为是
+            cutoff (`float`, optional): 模糊匹配的相似度阈值, 取值0~1, 默认为0.6
+        """
+        index = cls._name_index()
+        query = _normalize_name(query)
+
+        names = index.prefixed(query)
+        if query in index.by_name:
+            names.remove(query)
+            names.insert(0, query)
+        if fuzzy and (limit is None or len(names) < limit):
+            matched = set(names)
+            n = len(index.sorted_names) if limit is None else limit - len(names)
+            names += [name for name in difflib.get_close_matches(query, index.sorted_names, n + len(matched), cutoff)
+                      if name not in matched][:n]
+
+        if limit is not None:
+            names = names[:limit]
+        return [index.by_name[name] for name in names]  # type: ignore
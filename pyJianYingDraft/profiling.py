@@ -0,0 +1,178 @@
+"""可选的性能统计, 记录草稿生成流程中各主要函数的调用次数及累计耗时
+
+默认不启用, 此时被统计的函数保持原样, 没有额外开销. 在`profile()`语句块内启用:
+
+    with profiling.profile() as profiler:
+        ...  # 生成草稿
+    print(profiler.as_dict())
+    profiler.dump_chrome_trace("trace.json")  # 可在chrome://tracing或Perfetto中查看
+
+嵌套调用的函数各自计时, 即外层函数的耗时包含内层函数的耗时
+"""
+
+import os
+import sys
+import json
+import time
+import functools
+import threading
+from contextlib import contextmanager
+
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, TypeVar, Union, Any
+
+Func = TypeVar("Func", bound=Callable[..., Any])
+
+class Profiler:
+    """统计各函数的调用次数及累计耗时, 并可记录每次调用以导出为Chrome trace格式"""
+
+    counts: Dict[str, int]
+    """各函数的调用次数"""
+    totals: Dict[str, float]
+    """各函数的累计耗时, 单位为秒"""
+    events: List[Dict[str, Any]]
+    """记录的各次调用, 格式与Chrome trace的完整事件(`"ph": "X"`)一致"""
+    dropped_events: int
+    """由于超出`max_events`而未被记录的调用数"""
+
+    def __init__(self, *, record_events: bool = True, max_events: int = 1000000):
+        """
+        Args:
+            record_events (`bool`, optional): 是否记录每次调用以便导出Chrome trace, 默认为是
+            max_events (`int`, optional): 最多记录的调用数, 超出后仍会统计次数及耗时. 默认为1000000.
+        """
+        self.record_events = record_events
+        self.max_events = max_events
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """清空已有的统计数据及记录"""
+        with self._lock:
+            self.counts = {}
+            self.totals = {}
+            self.events = []
+            self.dropped_events = 0
+            self._origin = time.perf_counter()
+
+    def record(self, name: str, start: float, duration: float) -> None:
+        """记录一次调用
+
+        Args:
+            name (`str`): 函数名称
+            start (`float`): 开始时刻, 为`time.perf_counter()`的返回值
+            duration (`float`): 耗时, 单位为秒
+        """
+        with self._lock:
+            self.counts[name] = self.counts.get(name, 0) + 1
+            self.totals[name] = self.totals.get(name, 0.0) + duration
+            if not self.record_events:
+                return
+            if len(self.events) >= self.max_events:
+                self.dropped_events += 1
+                return
+            self.events.append({"name": name, "cat": "pyJianYingDraft", "ph": "X",
+                                "ts": (start - self._origin) * 1e6, "dur": duration * 1e6,
+                                "pid": os.getpid(), "tid": threading.get_ident()})
+
+    def as_dict(self) -> Dict[str, Dict[str, Union[int, float]]]:
+        """以字典形式返回各函数的调用次数`count`、累计耗时`total`及平均耗时`mean`(秒), 按累计耗时降序排列"""
+        with self._lock:
+            names = sorted(self.totals, key=self.totals.__getitem__, reverse=True)
+            return {name: {"count": self.counts[name], "total": self.totals[name],
+                           "mean": self.totals[name] / self.counts[name]} for name in names}
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """以Chrome trace格式(JSON对象形式)返回记录的各次调用"""
+        with self._lock:
+            return {"traceEvents": list(self.events), "displayTimeUnit": "ms"}
+
+    def dump_chrome_trace(self, path: str) -> None:
+        """将记录的各次调用以Chrome trace格式写入文件"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f)
+
+    def __repr__(self) -> str:
+        return f"Profiler(functions={len(self.counts)}, events={len(self.events)})"
+
+_active: Optional[Profiler] = None
+"""当前启用的统计器, 为None时不进行统计"""
+
+_registry: List[Tuple[Callable[..., Any], str]] = []
+"""以`timed`注册的函数及其统计名称"""
+_installed: List[Tuple[Any, str, Any]] = []
+"""已替换为计时版本的函数, 元素为(所属类或模块, 属性名, 原属性值)"""
+_install_lock = threading.Lock()
+
+def get_profiler() -> Optional[Profiler]:
+    """获取当前启用的统计器, 未启用时返回None"""
+    return _active
+
+def set_profiler(profiler: Optional[Profiler]) -> None:
+    """启用给定的统计器, 传入None则停止统计; 统计器为全局共享, 会统计所有线程中的调用"""
+    global _active
+    with _install_lock:
+        _active = profiler
+        if profiler is not None and not _installed:
+            _install()
+        elif profiler is None and _installed:
+            _uninstall()
+
+@contextmanager
+def profile(profiler: Optional[Profiler] = None) -> Iterator[Profiler]:
+    """在`with`语句块内启用统计, 退出时恢复此前的状态
+
+    Args:
+        profiler (`Profiler`, optional): 使用的统计器, 默认新建一个
+    """
+    previous = _active
+    profiler = Profiler() if profiler is None else profiler
+    set_profiler(profiler)
+    try:
+        yield profiler
+    finally:
+        set_profiler(previous)
+
+def timed(func: Func) -> Func:
+    """将函数注册为统计对象, 以其限定名称(如`Script_file.dumps`, 模块级函数则带上模块名)记录
+
+    函数本身不做改动, 仅在启用统计期间被替换为计时版本, 因此未启用时没有任何额外开销.
+    仅支持模块级函数及模块级类中的方法, 且通过`from ... import`直接引用的函数不会被统计.
+    """
+    name = func.__qualname__
+    if "." not in name:
+        name = func.__module__.rsplit(".", 1)[-1] + "." + name
+    _registry.append((func, name))
+    return func
+
+def _timed_wrapper(func: Callable[..., Any], name: str) -> Callable[..., Any]:
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        profiler = _active
+        if profiler is None:
+            return func(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler.record(name, start, time.perf_counter() - start)
+    return wrapper
+
+def _install() -> None:
+    for func, name in _registry:
+        owner: Any = sys.modules[func.__module__]
+        *path, attr = func.__qualname__.split(".")
+        for part in path:
+            owner = getattr(owner, part)
+        original = vars(owner)[attr]
+        if isinstance(original, staticmethod):
+            setattr(owner, attr, staticmethod(_timed_wrapper(func, name)))
+        elif isinstance(original, classmethod):
+            setattr(owner, attr, classmethod(_timed_wrapper(func, name)))
+        else:
+            setattr(owner, attr, _timed_wrapper(func, name))
+        _installed.append((owner, attr, original))
+
+def _uninstall() -> None:
+    while _installed:
+        owner, attr, original = _installed.pop()
+        setattr(owner, attr, original)
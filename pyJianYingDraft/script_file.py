@@ -1,15 +1,20 @@
 import os
-import json
+import re
 import math
-from copy import deepcopy
+import itertools
+from copy import copy, deepcopy
 
-from typing import Optional, Literal, Union, overload
-from typing import Type, Dict, List, Any
+from typing import Optional, Literal, Union, overload, TYPE_CHECKING
+from typing import Type, Dict, List, Set, Tuple, Mapping, Iterable, Iterator, Callable, Any
 
 from . import util
+from . import json_util
+from . import profiling
 from . import exceptions
-from .template_mode import ImportedTrack, EditableTrack, ImportedMediaTrack, ImportedTextTrack, Shrink_mode, Extend_mode, import_track
-from .time_util import Timerange, tim, srt_tstamp
+from . import subtitle_util
+from .template_mode import ImportedTrack, EditableTrack, ImportedMediaTrack, ImportedTextTrack, Shrink_mode, Extend_mode
+from .template_mode import import_track, import_track_lazy
+from .time_util import Timerange, tim
 from .local_materials import Video_material, Audio_material
 from .segment import Base_segment, Speed, Clip_settings
 from .audio_segment import Audio_segment, Audio_fade, Audio_effect
@@ -18,7 +23,8 @@ from .effect_segment import Effect_segment, Filter_segment
 from .text_segment import Text_segment, Text_style, TextBubble
 from .track import Track_type, Base_track, Track
 
-from .metadata import Video_scene_effect_type, Video_character_effect_type, Filter_type
+if TYPE_CHECKING:
+    from .metadata import Video_scene_effect_type, Video_character_effect_type, Filter_type
 
 class Script_material:
     """草稿文件中的素材信息部分"""
@@ -52,6 +58,30 @@ class Script_material:
     canvases: List[BackgroundFilling]
     """背景填充列表"""
 
+    _id_index: Dict[str, Dict[str, int]]
+    """各素材列表的id索引(素材id到其在列表中下标的映射), 键为列表名"""
+    _indexed_count: Dict[str, int]
+    """各素材列表中已被索引的素材数量"""
+    _last_indexed: Dict[str, Any]
+    """各素材列表中最后一个被索引的素材, 用于察觉列表被追加以外的方式修改"""
+
+    _ID_ATTRS: Dict[str, str] = {
+        "audios": "material_id",
+        "videos": "material_id",
+        "stickers": "id",
+        "texts": "id",
+        "audio_effects": "effect_id",
+        "audio_fades": "fade_id",
+        "animations": "animation_id",
+        "video_effects": "global_id",
+        "speeds": "global_id",
+        "masks": "id",
+        "transitions": "global_id",
+        "filters": "global_id",
+        "canvases": "global_id",
+    }
+    """各素材列表中素材id所在的属性名(对以字典形式存储的素材则为键名)"""
+
     def __init__(self):
         self.audios = []
         self.videos = []
@@ -69,6 +99,10 @@ class Script_material:
         self.filters = []
         self.canvases = []
 
+        self._id_index = {}
+        self._indexed_count = {}
+        self._last_indexed = {}
+
     @overload
     def __contains__(self, item: Union[Video_material, Audio_material]) -> bool: ...
     @overload
@@ -78,39 +112,103 @@ class Script_material:
 
     def __contains__(self, item) -> bool:
         if isinstance(item, Video_material):
-            return item.material_id in [video.material_id for video in self.videos]
+            return self._find_by_id("videos", item.material_id) is not None
         elif isinstance(item, Audio_material):
-            return item.material_id in [audio.material_id for audio in self.audios]
+            return self._find_by_id("audios", item.material_id) is not None
         elif isinstance(item, Audio_fade):
-            return item.fade_id in [fade.fade_id for fade in self.audio_fades]
+            return self._find_by_id("audio_fades", item.fade_id) is not None
         elif isinstance(item, Audio_effect):
-            return item.effect_id in [effect.effect_id for effect in self.audio_effects]
+            return self._find_by_id("audio_effects", item.effect_id) is not None
         elif isinstance(item, Segment_animations):
-            return item.animation_id in [ani.animation_id for ani in self.animations]
+            return self._find_by_id("animations", item.animation_id) is not None
         elif isinstance(item, Video_effect):
-            return item.global_id in [effect.global_id for effect in self.video_effects]
+            return self._find_by_id("video_effects", item.global_id) is not None
         elif isinstance(item, Transition):
-            return item.global_id in [transition.global_id for transition in self.transitions]
+            return self._find_by_id("transitions", item.global_id) is not None
         elif isinstance(item, Filter):
-            return item.global_id in [filter_.global_id for filter_ in self.filters]
+            return self._find_by_id("filters", item.global_id) is not None
         else:
             raise TypeError("Invalid argument type '%s'" % type(item))
 
+    def _get_index(self, kind: str) -> Dict[str, int]:
+        """获取指定素材列表的id索引, 并将列表中新追加的素材加入索引
+
+        素材列表应当只通过`append`追加元素, 若列表变短或最后一个已索引的素材不再位于原处(如先`pop`再`append`)则重建相应索引.
+        同一id对应多个素材时, 索引指向其中的第一个
+        """
+        items: List[Any] = getattr(self, kind)
+        index = self._id_index.setdefault(kind, {})
+        indexed_count = self._indexed_count.get(kind, 0)
+        if indexed_count > len(items) or (indexed_count > 0 and items[indexed_count - 1] is not self._last_indexed[kind]):
+            index.clear()
+            indexed_count = 0
+
+        id_attr = self._ID_ATTRS[kind]
+        for i in range(indexed_count, len(items)):
+            item = items[i]
+            item_id = item[id_attr] if isinstance(item, dict) else getattr(item, id_attr)
+            index.setdefault(item_id, i)
+        self._indexed_count[kind] = len(items)
+        self._last_indexed[kind] = items[-1] if items else None
+        return index
+
+    def _find_by_id(self, kind: str, material_id: str) -> Optional[Any]:
+        """在指定素材列表中查找id为`material_id`的第一个素材, 未找到时返回None
+
+        命中的素材若已不在原处或id已改变(如被原地替换), 则重建索引后重新查找
+        """
+        position = self._get_index(kind).get(material_id)
+        if position is None:
+            return None
+        item = getattr(self, kind)[position]
+        id_attr = self._ID_ATTRS[kind]
+        if (item[id_attr] if isinstance(item, dict) else getattr(item, id_attr)) == material_id:
+            return item
+        self._id_index[kind].clear()
+        self._indexed_count[kind] = 0
+        position = self._get_index(kind).get(material_id)
+        return None if position is None else getattr(self, kind)[position]
+
+    def get_by_id(self, material_id: str, kind: Optional[str] = None) -> Optional[Any]:
+        """根据id查找已添加的素材, 未找到时返回None
+
+        Args:
+            material_id (`str`): 素材id
+            kind (`str`, optional): 素材列表名, 如`videos`、`filters`等. 不指定则在所有素材列表中查找.
+
+        Raises:
+            `KeyError`: 不存在名为`kind`的素材列表
+        """
+        if kind is not None:
+            if kind not in self._ID_ATTRS:
+                raise KeyError("不存在名为 '%s' 的素材列表" % kind)
+            return self._find_by_id(kind, material_id)
+        for _kind in self._ID_ATTRS:
+            material = self._find_by_id(_kind, material_id)
+            if material is not None:
+                return material
+        return None
+
+    @profiling.timed
     def export_json(self) -> Dict[str, List[Any]]:
+        return {kind: list(materials) for kind, materials in self.export_json_lazy().items()}
+
+    def export_json_lazy(self) -> Dict[str, Iterable[Any]]:
+        """与`export_json`相同, 但需要导出的素材列表以迭代器形式给出, 供流式写入使用"""
         return {
             "ai_translates": [],
             "audio_balances": [],
-            "audio_effects": [effect.export_json() for effect in self.audio_effects],
-            "audio_fades": [fade.export_json() for fade in self.audio_fades],
+            "audio_effects": (effect.export_json() for effect in self.audio_effects),
+            "audio_fades": (fade.export_json() for fade in self.audio_fades),
             "audio_track_indexes": [],
-            "audios": [audio.export_json() for audio in self.audios],
+            "audios": (audio.export_json() for audio in self.audios),
             "beats": [],
-            "canvases": [canvas.export_json() for canvas in self.canvases],
+            "canvases": (canvas.export_json() for canvas in self.canvases),
             "chromas": [],
             "color_curves": [],
             "digital_humans": [],
             "drafts": [],
-            "effects": [_filter.export_json() for _filter in self.filters],
+            "effects": (_filter.export_json() for _filter in self.filters),
             "flowers": [],
             "green_screens": [],
             "handwrites": [],
@@ -120,7 +218,7 @@ class Script_material:
             "loudnesses": [],
             "manual_deformations": [],
             "masks": self.masks,
-            "material_animations": [ani.export_json() for ani in self.animations],
+            "material_animations": (ani.export_json() for ani in self.animations),
             "material_colors": [],
             "multi_language_refs": [],
             "placeholders": [],
@@ -131,16 +229,16 @@ class Script_material:
             "smart_crops": [],
             "smart_relights": [],
             "sound_channel_mappings": [],
-            "speeds": [spd.export_json() for spd in self.speeds],
+            "speeds": (spd.export_json() for spd in self.speeds),
             "stickers": self.stickers,
             "tail_leaders": [],
             "text_templates": [],
             "texts": self.texts,
             "time_marks": [],
-            "transitions": [transition.export_json() for transition in self.transitions],
-            "video_effects": [effect.export_json() for effect in self.video_effects],
+            "transitions": (transition.export_json() for transition in self.transitions),
+            "video_effects": (effect.export_json() for effect in self.video_effects),
             "video_trackings": [],
-            "videos": [video.export_json() for video in self.videos],
+            "videos": (video.export_json() for video in self.videos),
             "vocal_beautifys": [],
             "vocal_separations": []
         }
@@ -167,11 +265,22 @@ class Script_file:
     tracks: Dict[str, Track]
     """轨道信息"""
 
-    imported_materials: Dict[str, List[Dict[str, Any]]]
-    """导入的素材信息"""
+    _imported_materials: Dict[str, List[Dict[str, Any]]]
+    """导入的素材信息, 尚未解析的素材列表在此为空列表"""
+    _pending_materials: Dict[str, json_util.Encoded_json]
+    """延迟加载模板时尚未解析的素材列表的编码结果, 以素材类型为键"""
     imported_tracks: List[ImportedTrack]
     """导入的轨道信息"""
 
+    _json_chunks: Dict[int, Tuple[Any, json_util.Encoded_json]]
+    """增量保存时缓存的导入素材及轨道的编码结果, 以对象id为键, 同时保存对象本身以防id被复用"""
+    _dirty_ids: Set[int]
+    """自上次增量保存以来被修改过的导入素材及轨道的id"""
+    _shared_ids: Set[int]
+    """与其它分叉共享的导入素材的id, 这些素材在修改前需先复制"""
+    _material_indexes: Dict[Tuple[str, str], Tuple[List[Dict[str, Any]], int, Dict[Any, Tuple[int, ...]]]]
+    """导入素材的索引, 以(素材类型, 字段名)为键, 值为(被索引的素材列表, 已索引的素材数量, 字段值到素材下标的映射)"""
+
     TEMPLATE_FILE = "draft_content_template.json"
 
     def __init__(self, width: int, height: int, fps: int = 30):
@@ -192,18 +301,31 @@ class Script_file:
         self.materials = Script_material()
         self.tracks = {}
 
-        self.imported_materials = {}
+        self._imported_materials = {}
+        self._pending_materials = {}
         self.imported_tracks = []
 
+        self._json_chunks = {}
+        self._dirty_ids = set()
+        self._shared_ids = set()
+        self._material_indexes = {}
+
         with open(os.path.join(os.path.dirname(__file__), self.TEMPLATE_FILE), "r", encoding="utf-8") as f:
-            self.content = json.load(f)
+            self.content = json_util.load(f)
 
     @staticmethod
-    def load_template(json_path: str) -> "Script_file":
+    @profiling.timed
+    def load_template(json_path: str, *, lazy: bool = False) -> "Script_file":
         """从JSON文件加载草稿模板
 
+        延迟加载时, 导入的轨道在首次访问其片段时才被解析, 以缩进格式保存的草稿中的各类素材也在首次使用时才被解析,
+        适用于只需修改大型模板中少数轨道或素材的情形. 流式写入(`dump(streaming=True)`及`save`)时,
+        未被解析的轨道及素材列表直接原样写入, 而`dumps`及访问`imported_materials`则会解析所有内容.
+        此时`content`中不包含轨道信息.
+
         Args:
             json_path (str): JSON文件路径
+            lazy (bool, optional): 是否延迟加载. 默认为否.
 
         Raises:
             `FileNotFoundError`: JSON文件不存在
@@ -213,16 +335,182 @@ class Script_file:
         if not os.path.exists(json_path):
             raise FileNotFoundError("JSON文件 '%s' 不存在" % json_path)
         with open(json_path, "r", encoding="utf-8") as f:
-            obj.content = json.load(f)
+            if lazy:
+                obj._load_lazy(f.read())
+            else:
+                obj.content = json_util.load(f)
 
         util.assign_attr_with_json(obj, ["fps", "duration"], obj.content)
         util.assign_attr_with_json(obj, ["width", "height"], obj.content["canvas_config"])
+        if lazy:
+            return obj
 
-        obj.imported_materials = deepcopy(obj.content["materials"])
+        # 导入的素材及轨道直接引用加载的JSON数据, 不再复制
+        # dumps时会以新导出的素材和轨道替换content中的相应部分, 故不会相互影响
+        obj._imported_materials = obj.content["materials"]
         obj.imported_tracks = [import_track(track_data) for track_data in obj.content["tracks"]]
 
         return obj
 
+    def _load_lazy(self, text: str) -> None:
+        """延迟加载草稿内容: 缩进格式的草稿只拆分出各轨道及各类素材列表的编码结果, 其它格式则完整解析但延迟构造轨道"""
+        match = re.match(r'\{\n( +)"', text)
+        top_level = json_util.split_indented(text, len(match.group(1))) if match else None
+        if top_level is None:
+            self.content = json_util.loads(text)
+        else:
+            indent = len(match.group(1))
+            self.content = {}
+            for key, value_text in top_level:
+                children = json_util.split_indented(value_text, indent, 1) if key in ("materials", "tracks") else None
+                if children is None:
+                    self.content[key] = json_util.loads(value_text)
+                elif key == "materials":
+                    for material_type, list_text in children:
+                        assert material_type is not None
+                        self._imported_materials[material_type] = []
+                        self._pending_materials[material_type] = json_util.Encoded_json(list_text, indent, 2)
+                    self.content[key] = self._imported_materials
+                else:
+                    for _, track_text in children:
+                        encoded = json_util.Encoded_json(track_text, indent, 2)
+                        track = import_track_lazy(encoded)
+                        self.imported_tracks.append(track)
+                        # 轨道被解析后, 只要未被修改, 增量保存时仍可原样写入
+                        self._json_chunks[id(track)] = (track, encoded)
+                    self.content[key] = []
+
+        self._imported_materials = self.content["materials"]
+        if not self.imported_tracks:
+            self.imported_tracks = [import_track_lazy(track_data) for track_data in self.content["tracks"]]
+
+    @property
+    def imported_materials(self) -> Dict[str, List[Dict[str, Any]]]:
+        """导入的素材信息, 以素材类型为键
+
+        延迟加载模板时, 访问此属性会解析所有尚未解析的素材列表, 只需某类素材时可使用`get_imported_materials`
+        """
+        for material_type in list(self._pending_materials):
+            self.get_imported_materials(material_type)
+        return self._imported_materials
+
+    @imported_materials.setter
+    def imported_materials(self, imported_materials: Dict[str, List[Dict[str, Any]]]) -> None:
+        self._imported_materials = imported_materials
+        self._pending_materials = {}
+
+    def get_imported_materials(self, material_type: str) -> List[Dict[str, Any]]:
+        """获取指定类型的导入素材列表, 延迟加载模板时只解析该类素材
+
+        Args:
+            material_type (`str`): 素材类型, 即草稿文件中`materials`下的键名, 如`videos`、`texts`等
+
+        Raises:
+            `KeyError`: 草稿中不存在该类型的素材
+        """
+        encoded = self._pending_materials.pop(material_type, None)
+        if encoded is not None:
+            material_list = json_util.loads(encoded.text)
+            self._imported_materials[material_type] = material_list
+            # 解析结果与原始编码逐个对应, 可直接作为增量保存的编码缓存
+            assert encoded.indent is not None
+            material_texts = json_util.split_indented(encoded.text, encoded.indent, encoded.level)
+            if material_texts is not None and len(material_texts) == len(material_list):
+                for mat, (_, mat_text) in zip(material_list, material_texts):
+                    self._json_chunks[id(mat)] = (mat, json_util.Encoded_json(mat_text, encoded.indent, encoded.level + 1))
+        return self._imported_materials[material_type]
+
+    def fork(self) -> "Script_file":
+        """在内存中复制出一份独立的草稿, 适用于由同一模板批量生成草稿, 从而避免反复加载及解析模板文件
+
+        新草稿与原草稿共享导入的素材数据, 仅在`replace_text`等方法修改某个素材时才复制该素材(写时复制);
+        导入的轨道及新添加的素材、轨道则会被复制, 但导入轨道的原始数据仍然共享.
+        新草稿没有保存路径, 可通过`dump`或`Draft_folder.save_as_draft`写入文件.
+
+        首次分叉时会预先以4格缩进编码原草稿中导入的素材及轨道, 此后各草稿的增量保存(`save(incremental=True)`)
+        只需编码各自修改过的部分.
+
+        注意: 直接修改`imported_materials`中的素材数据会同时影响共享该数据的其它草稿
+        """
+        if not self._json_chunks:
+            self._warm_json_chunks(4)
+        self._shared_ids.update(id(mat) for material_list in self._imported_materials.values() for mat in material_list)
+
+        forked = copy(self)
+        forked.save_path = None
+        forked.content = dict(self.content)
+        forked._imported_materials = {material_type: list(material_list)
+                                      for material_type, material_list in self._imported_materials.items()}
+        forked._pending_materials = dict(self._pending_materials)
+        forked.content["materials"] = forked._imported_materials
+        forked.materials, forked.tracks, forked.imported_tracks = deepcopy((self.materials, self.tracks, self.imported_tracks))
+
+        # 复制出的素材列表顺序不变, 可沿用原有索引
+        forked._material_indexes = {key: (forked._imported_materials[key[0]], count, dict(index))
+                                    for key, (material_list, count, index) in self._material_indexes.items()
+                                    if material_list is self._imported_materials.get(key[0])}
+        forked._shared_ids = set(self._shared_ids)
+        forked._dirty_ids = set(self._dirty_ids)
+        forked._json_chunks = {key: value for key, value in self._json_chunks.items() if key in self._shared_ids}
+        # 复制出的轨道内容与原轨道相同, 可沿用原轨道的编码结果
+        for track, forked_track in zip(self.imported_tracks, forked.imported_tracks):
+            cached = self._json_chunks.get(id(track))
+            if cached is not None and cached[0] is track and id(track) not in self._dirty_ids:
+                forked._json_chunks[id(forked_track)] = (forked_track, cached[1])
+        return forked
+
+    def _writable_material(self, material_list: List[Dict[str, Any]], index: int) -> Dict[str, Any]:
+        """获取可修改的导入素材, 若该素材与其它分叉共享则先复制一份替换之"""
+        mat = material_list[index]
+        if id(mat) in self._shared_ids:
+            mat = deepcopy(mat)
+            material_list[index] = mat
+        return mat
+
+    def _find_imported_materials(self, material_type: str, key: str, value: Any, rebuild: bool = False) -> Tuple[int, ...]:
+        """查找指定类型的导入素材中`key`字段等于`value`的素材, 按顺序返回其下标
+
+        索引在首次查找时建立, 此后随素材列表的追加增量更新; 若发现索引与素材不符(如素材被直接修改过)则重建索引.
+        索引无法察觉直接修改素材后新出现的匹配项, 故调用方在未找到素材而将要报错时, 应以`rebuild=True`再查找一次
+
+        Args:
+            rebuild (`bool`, optional): 是否丢弃现有索引并重建, 默认为否
+
+        Raises:
+            `KeyError`: 草稿中不存在该类型的素材
+        """
+        if rebuild:
+            self._material_indexes.pop((material_type, key), None)
+        material_list = self.get_imported_materials(material_type)
+        entry = self._material_indexes.get((material_type, key))
+        if entry is None or entry[0] is not material_list or entry[1] > len(material_list):
+            entry = (material_list, 0, {})
+        index = entry[2]
+        for i in range(entry[1], len(material_list)):
+            field = material_list[i].get(key)
+            index[field] = index.get(field, ()) + (i,)
+        self._material_indexes[(material_type, key)] = (material_list, len(material_list), index)
+
+        indices = index.get(value, ())
+        if all(material_list[i].get(key) == value for i in indices):
+            return indices
+        del self._material_indexes[(material_type, key)]
+        return self._find_imported_materials(material_type, key, value)
+
+    def _reindex_imported_material(self, material_type: str, material_index: int, key: str, old_value: Any) -> None:
+        """在修改了导入素材的`key`字段后更新相应索引"""
+        entry = self._material_indexes.get((material_type, key))
+        if entry is None or material_index >= entry[1]:
+            return
+        material_list, _, index = entry
+        new_value = material_list[material_index].get(key)
+        remaining = tuple(i for i in index.get(old_value, ()) if i != material_index)
+        if remaining:
+            index[old_value] = remaining
+        else:
+            index.pop(old_value, None)
+        index[new_value] = tuple(sorted(index.get(new_value, ()) + (material_index,)))
+
     def add_material(self, material: Union[Video_material, Audio_material]) -> "Script_file":
         """向草稿文件中添加一个素材"""
         if material in self.materials:  # 素材已存在
@@ -283,6 +571,7 @@ class Script_file:
 
         return next(track for track in self.tracks.values() if track.accept_segment_type == segment_type)
 
+    @profiling.timed
     def add_segment(self, segment: Union[Video_segment, Sticker_segment, Audio_segment, Text_segment],
                     track_name: Optional[str] = None) -> "Script_file":
         """向指定轨道中添加一个片段
@@ -300,6 +589,44 @@ class Script_file:
 
         # 加入轨道并更新时长
         target.add_segment(segment)
+        self._add_segment_materials(segment)
+
+        return self
+
+    @profiling.timed
+    def add_segments(self, segments: Iterable[Union[Video_segment, Sticker_segment, Audio_segment, Text_segment]],
+                     track_name: Optional[str] = None) -> "Script_file":
+        """向指定轨道中批量添加同一类型的片段, 效果与逐个调用`add_segment`相同
+
+        轨道只查找一次, 且按时间顺序给出的片段直接追加至轨道末尾, 适合添加大量字幕等片段
+
+        Args:
+            segments (`Iterable[...]`): 要添加的片段, 可以是生成器, 所有片段的类型须相同
+            track_name (`str`, optional): 添加到的轨道名称. 当此类型的轨道仅有一条时可省略.
+
+        Raises:
+            `NameError`: 未找到指定名称的轨道, 或必须提供`track_name`参数时未提供
+            `TypeError`: 片段类型不匹配轨道类型
+            `SegmentOverlap`: 片段与已有片段重叠, 此前的片段已被添加
+        """
+        segment_iter = iter(segments)
+        first = next(segment_iter, None)
+        if first is None:
+            return self
+        target = self._get_track(type(first), track_name)
+
+        def registered() -> Iterator[Any]:
+            for segment in itertools.chain([first], segment_iter):
+                yield segment
+                # 片段被加入轨道后才会继续迭代, 此时再添加相关素材, 与`add_segment`的顺序一致
+                self._add_segment_materials(segment)
+
+        target.add_segments(registered())
+        return self
+
+    @profiling.timed
+    def _add_segment_materials(self, segment: Base_segment) -> None:
+        """更新草稿时长, 并添加已加入轨道的片段所需的素材"""
         self.duration = max(self.duration, segment.end)
 
         # 自动添加相关素材
@@ -354,9 +681,7 @@ class Script_file:
         if isinstance(segment, (Video_segment, Audio_segment)):
             self.add_material(segment.material_instance)
 
-        return self
-
-    def add_effect(self, effect: Union[Video_scene_effect_type, Video_character_effect_type],
+    def add_effect(self, effect: Union["Video_scene_effect_type", "Video_character_effect_type"],
                    t_range: Timerange, track_name: Optional[str] = None, *,
                    params: Optional[List[Optional[float]]] = None) -> "Script_file":
         """向指定的特效轨道中添加一个特效片段
@@ -385,7 +710,7 @@ class Script_file:
             self.materials.video_effects.append(segment.effect_inst)
         return self
 
-    def add_filter(self, filter_meta: Filter_type, t_range: Timerange,
+    def add_filter(self, filter_meta: "Filter_type", t_range: Timerange,
                    track_name: Optional[str] = None, intensity: float = 100.0) -> "Script_file":
         """向指定的滤镜轨道中添加一个滤镜片段
 
@@ -411,17 +736,20 @@ class Script_file:
         self.materials.filters.append(segment.material)
         return self
 
+    @profiling.timed
     def import_srt(self, srt_path: str, track_name: str, *,
                    time_offset: Union[str, float] = 0.0,
                    style_reference: Optional[Text_segment] = None,
                    text_style: Text_style = Text_style(size=5, align=1),
                    clip_settings: Optional[Clip_settings] = Clip_settings(transform_y=-0.8)) -> "Script_file":
-        """从SRT文件中导入字幕, 支持传入一个`Text_segment`作为样式参考
+        """从SRT或WebVTT文件中导入字幕, 支持传入一个`Text_segment`作为样式参考
+
+        字幕文件被逐条读取并批量加入轨道, 以文件是否以`WEBVTT`开头判断格式
 
         注意: 默认不会使用参考片段的`clip_settings`属性, 若需要请显式为此函数传入`clip_settings=None`
 
         Args:
-            srt_path (`str`): SRT文件路径
+            srt_path (`str`): SRT或WebVTT文件路径
             track_name (`str`): 导入到的文本轨道名称, 若不存在则自动创建
             style_reference (`Text_segment`, optional): 作为样式参考的文本片段, 若提供则使用其样式.
             time_offset (`Union[str, float]`, optional): 字幕整体时间偏移, 单位为微秒, 默认为0.
@@ -431,6 +759,7 @@ class Script_file:
         Raises:
             `NameError`: 已存在同名轨道
             `TypeError`: 轨道类型不匹配
+            `ValueError`: 字幕格式错误
         """
         if style_reference is None and clip_settings is None:
             raise ValueError("未提供样式参考时请提供`clip_settings`参数")
@@ -439,55 +768,17 @@ class Script_file:
         if track_name not in self.tracks:
             self.add_track(Track_type.text, track_name, relative_index=999)  # 在所有文本轨道的最上层
 
-        with open(srt_path, "r", encoding="utf-8-sig") as srt_file:
-            lines = srt_file.readlines()
-
-        def __add_text_segment(text: str, t_range: Timerange) -> None:
+        def __make_text_segment(cue: subtitle_util.Subtitle_cue) -> Text_segment:
+            t_range = Timerange(cue.timerange.start + time_offset, cue.timerange.duration)
             if style_reference:
-                seg = Text_segment.create_from_template(text, t_range, style_reference)
+                seg = Text_segment.create_from_template(cue.text, t_range, style_reference)
                 if clip_settings is not None:
                     seg.clip_settings = deepcopy(clip_settings)
             else:
-                seg = Text_segment(text, t_range, style=text_style, clip_settings=clip_settings)
-            self.add_segment(seg, track_name)
-
-        index = 0
-        text: str = ""
-        text_trange: Timerange
-        read_state: Literal["index", "timestamp", "content"] = "index"
-        while index < len(lines):
-            line = lines[index].strip()
-            if read_state == "index":
-                if len(line) == 0:
-                    index += 1
-                    continue
-                if not line.isdigit():
-                    raise ValueError("Expected a number at line %d, got '%s'" % (index+1, line))
-                index += 1
-                read_state = "timestamp"
-            elif read_state == "timestamp":
-                # 读取时间戳
-                start_str, end_str = line.split(" --> ")
-                start, end = srt_tstamp(start_str), srt_tstamp(end_str)
-                text_trange = Timerange(start + time_offset, end - start)
-
-                index += 1
-                read_state = "content"
-            elif read_state == "content":
-                # 内容结束, 生成片段
-                if len(line) == 0:
-                    __add_text_segment(text.strip(), text_trange)
-
-                    text = ""
-                    read_state = "index"
-                else:
-                    text += line + "\n"
-                index += 1
-
-        # 添加最后一个片段
-        if len(text) > 0:
-            __add_text_segment(text.strip(), text_trange)
+                seg = Text_segment(cue.text, t_range, style=text_style, clip_settings=clip_settings)
+            return seg
 
+        self.add_segments(map(__make_text_segment, subtitle_util.iter_subtitle_cues(srt_path)), track_name)
         return self
 
     def get_imported_track(self, track_type: Literal[Track_type.video, Track_type.audio, Track_type.text],
@@ -567,14 +858,22 @@ class Script_file:
             extra_refs: List[str] = segment.get("extra_material_refs", [])
             material_ids.update(extra_refs)
 
-        # 复制素材
-        for material_type, material_list in source_file.imported_materials.items():
-            for material in material_list:
-                if material.get("id") in material_ids:
-                    if material_type not in self.imported_materials:
-                        self.imported_materials[material_type] = []
-                    self.imported_materials[material_type].append(deepcopy(material))
-                    material_ids.remove(material.get("id"))
+        # 复制素材, 尚未解析的素材列表仅在其中可能含有所需素材时才解析
+        for material_type in list(source_file._imported_materials):
+            encoded = source_file._pending_materials.get(material_type)
+            if encoded is not None and not any('"id": %s' % json_util.dumps_str(material_id) in encoded.text
+                                               for material_id in material_ids):
+                continue
+            found: List[int] = []
+            for material_id in list(material_ids):
+                indices = source_file._find_imported_materials(material_type, "id", material_id)
+                if indices:
+                    found.append(indices[0])
+                    material_ids.remove(material_id)
+            for index in sorted(found):  # 保持素材原有的顺序
+                if material_type not in self._imported_materials:
+                    self._imported_materials[material_type] = []
+                self.get_imported_materials(material_type).append(deepcopy(source_file.get_imported_materials(material_type)[index]))
 
         assert len(material_ids) == 0, "未找到以下素材: %s" % material_ids
 
@@ -600,17 +899,18 @@ class Script_file:
         """
         video_mode = isinstance(material, Video_material)
         # 查找素材
-        target_json_obj: Optional[Dict[str, Any]] = None
-        target_material_list = self.imported_materials["videos" if video_mode else "audios"]
+        material_type = "videos" if video_mode else "audios"
         name_key = "material_name" if video_mode else "name"
-        for mat in target_material_list:
-            if mat[name_key] == material_name:
-                if target_json_obj is not None:
-                    raise exceptions.AmbiguousMaterial(
-                        "找到多个名为 '%s', 类型为 '%s' 的素材" % (material_name, type(material)))
-                target_json_obj = mat
-        if target_json_obj is None:
+        target_indices = self._find_imported_materials(material_type, name_key, material_name)
+        if len(target_indices) == 0:  # 素材名称可能被直接修改过, 重建索引后再次查找
+            target_indices = self._find_imported_materials(material_type, name_key, material_name, rebuild=True)
+        if len(target_indices) > 1:
+            raise exceptions.AmbiguousMaterial(
+                "找到多个名为 '%s', 类型为 '%s' 的素材" % (material_name, type(material)))
+        if len(target_indices) == 0:
             raise exceptions.MaterialNotFound("没有找到名为 '%s', 类型为 '%s' 的素材" % (material_name, type(material)))
+        target_index = target_indices[0]
+        target_json_obj = self._writable_material(self.get_imported_materials(material_type), target_index)
 
         # 更新素材信息
         target_json_obj.update({name_key: material.material_name, "path": material.path, "duration": material.duration})
@@ -618,6 +918,8 @@ class Script_file:
             target_json_obj.update({"width": material.width, "height": material.height, "material_type": material.material_type})
             if replace_crop:
                 target_json_obj.update({"crop": material.crop_settings.export_json()})
+        self._reindex_imported_material(material_type, target_index, name_key, material_name)
+        self._dirty_ids.add(id(target_json_obj))
 
         return self
 
@@ -663,6 +965,7 @@ class Script_file:
         # 最后替换素材链接
         track.segments[segment_index].material_id = material.material_id
         self.add_material(material)
+        self._dirty_ids.add(id(track))
 
         # TODO: 更新总长
         return self
@@ -671,6 +974,8 @@ class Script_file:
                      recalc_style: bool = True) -> "Script_file":
         """替换指定文本轨道上指定片段的文字内容, 支持普通文本片段或文本模板片段
 
+        需要替换同一轨道上的多个片段时, 使用`replace_texts`更为高效
+
         Args:
             track (`Editable_track`): 要替换文字的文本轨道, 由`get_imported_track`获取
             segment_index (`int`): 要替换文字的片段下标, 从0开始
@@ -682,95 +987,127 @@ class Script_file:
             `TypeError`: 轨道类型不正确
             `ValueError`: 文本模板片段的文本数量不匹配
         """
-        if not isinstance(track, ImportedTextTrack):
-            raise TypeError("指定的轨道(类型为 %s)不支持文本内容替换" % track.track_type)
-        if not 0 <= segment_index < len(track):
-            raise IndexError("片段下标 %d 超出 [0, %d) 的范围" % (segment_index, len(track)))
+        return self.replace_texts(track, {segment_index: text}, recalc_style)
 
-        def __recalc_style_range(old_len: int, new_len: int, styles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-            """调整字体样式分布"""
-            new_styles: List[Dict[str, Any]] = []
-            for style in styles:
-                start = math.ceil(style["range"][0] / old_len * new_len)
-                end = math.ceil(style["range"][1] / old_len * new_len)
-                style["range"] = [start, end]
-                if start != end:
-                    new_styles.append(style)
-            return new_styles
-
-        replaced: bool = False
-        material_id: str = track.segments[segment_index].material_id
-        # 尝试在文本素材中替换
-        for mat in self.imported_materials["texts"]:
-            if mat["id"] != material_id:
-                continue
+    def replace_texts(self, track: EditableTrack, texts: Mapping[int, Union[str, List[str]]],
+                      recalc_style: bool = True) -> "Script_file":
+        """批量替换指定文本轨道上多个片段的文字内容, 效果与逐个调用`replace_text`相同
 
-            if isinstance(text, list):
-                if len(text) != 1:
-                    raise ValueError(f"正常文本片段只能有一个文字内容, 但替换内容是 {text}")
-                text = text[0]
-
-            content = json.loads(mat["content"])
-            if recalc_style:
-                content["styles"] = __recalc_style_range(len(content["text"]), len(text), content["styles"])
-            content["text"] = text
-            mat["content"] = json.dumps(content, ensure_ascii=False)
-            replaced = True
-            break
-        if replaced:
-            return self
+        所有片段的素材一次性查找完毕后再进行替换, 每个文本素材的内容只解析和编码一次;
+        参数有误时不会修改任何素材. 若多个片段引用同一文本素材, 以最后给出的文字内容为准.
+
+        Args:
+            track (`Editable_track`): 要替换文字的文本轨道, 由`get_imported_track`获取
+            texts (`Mapping[int, str or List[str]]`): 片段下标(从0开始)到新文字内容的映射, 文字内容的含义同`replace_text`
+            recalc_style (`bool`): 是否重新计算字体样式分布, 即调整各字体样式应用范围以尽量维持原有占比不变, 默认开启.
 
-        # 尝试在文本模板中替换
-        for template in self.imported_materials["text_templates"]:
-            if template["id"] != material_id:
+        Raises:
+            `IndexError`: 片段下标越界
+            `TypeError`: 轨道类型不正确
+            `ValueError`: 文本模板片段的文本数量不匹配
+        """
+        if not isinstance(track, ImportedTextTrack):
+            raise TypeError("指定的轨道(类型为 %s)不支持文本内容替换" % track.track_type)
+
+        # 先确定各文本素材的新内容, 以文本素材的下标为键, 值为(新内容, 是否为文本模板的一部分)
+        new_contents: Dict[int, Tuple[str, bool]] = {}
+        for segment_index, text in texts.items():
+            if not 0 <= segment_index < len(track):
+                raise IndexError("片段下标 %d 超出 [0, %d) 的范围" % (segment_index, len(track)))
+            material_id: str = track.segments[segment_index].material_id
+
+            text_indices = self._find_imported_materials("texts", "id", material_id)
+            template_indices = () if text_indices else self._find_imported_materials("text_templates", "id", material_id)
+            if not text_indices and not template_indices:  # 素材id可能被直接修改过, 重建索引后再次查找
+                text_indices = self._find_imported_materials("texts", "id", material_id, rebuild=True)
+                template_indices = () if text_indices else \
+                    self._find_imported_materials("text_templates", "id", material_id, rebuild=True)
+
+            # 普通文本片段
+            if text_indices:
+                if isinstance(text, list):
+                    if len(text) != 1:
+                        raise ValueError(f"正常文本片段只能有一个文字内容, 但替换内容是 {text}")
+                    text = text[0]
+                new_contents[text_indices[0]] = (text, False)
                 continue
 
+            # 文本模板片段
+            assert template_indices, f"未找到指定片段的素材 {material_id}"
+            template = self.get_imported_materials("text_templates")[template_indices[0]]
             resources = template["text_info_resources"]
             if isinstance(text, str):
                 text = [text]
             if len(text) > len(resources):
                 raise ValueError(f"文字模板'{template['name']}'只有{len(resources)}段文本, 但提供了{len(text)}段替换内容")
-
             for sub_material_id, new_text in zip(map(lambda x: x["text_material_id"], resources), text):
-                for mat in self.imported_materials["texts"]:
-                    if mat["id"] != sub_material_id:
-                        continue
-
-                    if isinstance(mat["content"], str):
-                        mat["content"] = new_text
-                    else:
-                        content = json.loads(mat["content"])
-                        if recalc_style:
-                            content["styles"] = __recalc_style_range(len(content["text"]), len(new_text), content["styles"])
-                        content["text"] = new_text
-                        mat["content"] = json.dumps(content, ensure_ascii=False)
-                    break
-            replaced = True
-            break
-
-        assert replaced, f"未找到指定片段的素材 {material_id}"
+                sub_indices = self._find_imported_materials("texts", "id", sub_material_id) or \
+                    self._find_imported_materials("texts", "id", sub_material_id, rebuild=True)
+                for index in sub_indices[:1]:
+                    new_contents[index] = (new_text, True)
+
+        text_materials = self.get_imported_materials("texts")
+        for index, (new_text, in_template) in new_contents.items():
+            mat = self._writable_material(text_materials, index)
+            if in_template and isinstance(mat["content"], str):
+                mat["content"] = new_text
+            else:
+                content = json_util.loads(mat["content"])
+                if recalc_style:
+                    content["styles"] = self._recalc_style_range(len(content["text"]), len(new_text), content["styles"])
+                content["text"] = new_text
+                mat["content"] = json_util.dumps(content)
+            self._dirty_ids.add(id(mat))
+
+        return self
 
+    @staticmethod
+    def _recalc_style_range(old_len: int, new_len: int, styles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """按文字长度的变化调整字体样式分布"""
+        new_styles: List[Dict[str, Any]] = []
+        for style in styles:
+            start = math.ceil(style["range"][0] / old_len * new_len)
+            end = math.ceil(style["range"][1] / old_len * new_len)
+            style["range"] = [start, end]
+            if start != end:
+                new_styles.append(style)
+        return new_styles
+
+    def mark_dirty(self, *objs: Union[Dict[str, Any], ImportedTrack]) -> "Script_file":
+        """标记被直接修改过的导入素材(`imported_materials`中的字典)或导入轨道, 使增量保存时重新编码它们,
+        标记素材时还会使按id及名称查找素材的索引失效
+
+        `replace_text`等方法会自动标记其修改的内容, 仅在直接修改导入的JSON数据或轨道时需要调用本方法
+        """
+        self._dirty_ids.update(id(obj) for obj in objs)
+        if any(isinstance(obj, dict) for obj in objs):
+            self._material_indexes.clear()
         return self
 
     def inspect_material(self) -> None:
         """输出草稿中导入的贴纸、文本气泡以及花字素材的元数据"""
         print("贴纸素材:")
-        for sticker in self.imported_materials["stickers"]:
+        for sticker in self.get_imported_materials("stickers"):
             print("\tResource id: %s '%s'" % (sticker["resource_id"], sticker.get("name", "")))
 
         print("文字气泡效果:")
-        for effect in self.imported_materials["effects"]:
+        for effect in self.get_imported_materials("effects"):
             if effect["type"] == "text_shape":
                 print("\tEffect id: %s ,Resource id: %s '%s'" %
                       (effect["effect_id"], effect["resource_id"], effect.get("name", "")))
 
         print("花字效果:")
-        for effect in self.imported_materials["effects"]:
+        for effect in self.get_imported_materials("effects"):
             if effect["type"] == "text_effect":
                 print("\tResource id: %s '%s'" % (effect["resource_id"], effect.get("name", "")))
 
-    def dumps(self) -> str:
-        """将草稿文件内容导出为JSON字符串"""
+    @profiling.timed
+    def dumps(self, indent: Optional[int] = 4) -> str:
+        """将草稿文件内容导出为JSON字符串
+
+        Args:
+            indent (`int`, optional): 缩进空格数, 为None时不换行缩进. 默认为4.
+        """
         self.content["fps"] = self.fps
         self.content["duration"] = self.duration
         self.content["canvas_config"] = {"width": self.width, "height": self.height, "ratio": "original"}
@@ -784,24 +1121,190 @@ class Script_file:
                 self.content["materials"][material_type].extend(material_list)
 
         # 对轨道排序并导出
+        self.content["tracks"] = [track.export_json() for track in self._sorted_tracks()]
+
+        return json_util.dumps(self.content, indent=indent)
+
+    def _sorted_tracks(self) -> List[Base_track]:
+        """按渲染顺序排列的所有轨道, 包括导入的轨道"""
         track_list: List[Base_track] = list(self.tracks.values())
         track_list.extend(self.imported_tracks)
         track_list.sort(key=lambda track: track.render_index)
-        self.content["tracks"] = [track.export_json() for track in track_list]
+        return track_list
 
-        return json.dumps(self.content, ensure_ascii=False, indent=4)
+    @profiling.timed
+    def dump(self, file_path: str, *, indent: Optional[int] = 4, streaming: bool = False) -> None:
+        """将草稿文件内容写入文件
 
-    def dump(self, file_path: str) -> None:
-        """将草稿文件内容写入文件"""
+        Args:
+            file_path (`str`): 写入的文件路径
+            indent (`int`, optional): 缩进空格数, 为None时不换行缩进. 默认为4.
+            streaming (`bool`, optional): 是否逐个素材/片段地导出并写入文件, 而非先生成完整的JSON字符串,
+                适用于较大的草稿. 写入的内容与非流式写入完全一致, 但不会更新`content`中的素材和轨道信息. 默认为否.
+        """
         with open(file_path, "w", encoding="utf-8") as f:
-            f.write(self.dumps())
+            if streaming:
+                json_util.dump_stream(self._export_content_lazy(indent), f, indent=indent)
+            else:
+                f.write(self.dumps(indent))
+
+    def _export_content_lazy(self, indent: Optional[int] = None, incremental: bool = False) -> Dict[str, Any]:
+        """生成待以`indent`缩进流式写入的草稿内容, 其中各素材列表及轨道列表均以迭代器形式给出
+
+        增量模式下, 导入的素材及轨道预先编码, 并尽量复用缓存的编码结果.
+        延迟加载而尚未解析的素材列表及轨道在缩进一致时直接使用其原始编码结果.
+        """
+        def chunk(obj: Any, export: Callable[[], Any], level: int) -> Any:
+            return self._encoded_chunk(obj, export, indent, level) if incremental else export()
+
+        def export_track(track: Base_track) -> Any:
+            if isinstance(track, ImportedTrack):
+                pending = track.pending_json(indent)
+                if pending is not None:
+                    return pending
+                if incremental:
+                    return chunk(track, track.export_json, 2)
+            return track.export_json_lazy()
+
+        content = dict(self.content)
+        content["fps"] = self.fps
+        content["duration"] = self.duration
+        content["canvas_config"] = {"width": self.width, "height": self.height, "ratio": "original"}
+
+        # 合并导入的素材
+        def imported(material_type: str) -> Iterator[Any]:
+            if material_type not in self._imported_materials:
+                return iter(())
+            return (chunk(mat, lambda mat=mat: mat, 3) for mat in self.get_imported_materials(material_type))
+
+        def merged(material_type: str, material_list: Iterable[Any]) -> Union[Iterator[Any], json_util.Encoded_json]:
+            encoded = self._pending_materials.get(material_type)
+            if encoded is None or encoded.indent != indent:
+                return itertools.chain(material_list, imported(material_type))
+            iterator = iter(material_list)
+            first = next(iterator, None)
+            if first is None:
+                return encoded  # 没有新素材时原样写入
+            return itertools.chain([first], iterator, imported(material_type))
+
+        materials: Dict[str, Union[Iterator[Any], json_util.Encoded_json]] = {}
+        for material_type, material_list in self.materials.export_json_lazy().items():
+            materials[material_type] = merged(material_type, material_list)
+        for material_type in self._imported_materials:
+            if material_type not in materials:
+                materials[material_type] = merged(material_type, ())
+        content["materials"] = materials
+
+        content["tracks"] = (export_track(track) for track in self._sorted_tracks())
+        return content
+
+    def _encoded_chunk(self, obj: Any, export: Callable[[], Any], indent: Optional[int], level: int) -> json_util.Encoded_json:
+        """获取导入素材或轨道位于第`level`层时的编码结果, 未被修改过时复用缓存"""
+        key = id(obj)
+        cached = self._json_chunks.get(key)
+        if cached is not None and cached[0] is obj and key not in self._dirty_ids and cached[1].indent == indent:
+            return cached[1]
+        encoded = json_util.Encoded_json.encode(export(), indent, level)
+        self._json_chunks[key] = (obj, encoded)
+        return encoded
+
+    def _warm_json_chunks(self, indent: int) -> None:
+        """预先编码所有导入的素材及轨道, 能从已保存的文件中截取的部分直接截取"""
+        if self.save_path is not None and os.path.exists(self.save_path):
+            self._prime_json_chunks(self.save_path, indent)
+        for material_list in self._imported_materials.values():
+            for mat in material_list:
+                self._encoded_chunk(mat, lambda: mat, indent, 3)
+        for track in self.imported_tracks:
+            if not track.pending:
+                self._encoded_chunk(track, track.export_json, indent, 2)
 
-    def save(self) -> None:
+    def _prime_json_chunks(self, file_path: str, indent: int) -> None:
+        """从此前写入的草稿文件中截取各导入素材及轨道的编码结果, 作为增量保存的初始缓存
+
+        截取的片段仅在解析结果与当前内容的编码结果必然相同时才会被采用, 因此加载后被修改过的内容总会被重新编码
+        """
+        with open(file_path, "r", encoding="utf-8") as f:
+            top_level = json_util.split_indented(f.read(), indent)
+        if top_level is None:
+            return  # 非缩进格式(如剪映保存的文件), 无法截取
+
+        material_texts: Dict[str, str] = {}
+        track_texts: Dict[str, str] = {}
+        for key, text in top_level:
+            if key == "materials":
+                for _, material_list_text in json_util.split_indented(text, indent, 1) or []:
+                    for _, mat_text in json_util.split_indented(material_list_text, indent, 2) or []:
+                        material_texts[self._chunk_id(mat_text, indent, 3)] = mat_text
+            elif key == "tracks":
+                for _, track_text in json_util.split_indented(text, indent, 1) or []:
+                    track_texts[self._chunk_id(track_text, indent, 2)] = track_text
+
+        def prime(obj: Any, chunk_id: Any, texts: Dict[str, str], export: Callable[[], Any], level: int) -> None:
+            text = texts.get(chunk_id) if isinstance(chunk_id, str) else None
+            if text is None or id(obj) in self._dirty_ids or id(obj) in self._json_chunks:
+                return
+            if json_util.encodes_identically(json_util.loads(text), export()):
+                self._json_chunks[id(obj)] = (obj, json_util.Encoded_json(text, indent, level))
+
+        for material_list in self._imported_materials.values():
+            for mat in material_list:
+                prime(mat, mat.get("id"), material_texts, lambda: mat, 3)
+        for track in self.imported_tracks:
+            if not track.pending:
+                prime(track, track.track_id, track_texts, track.export_json, 2)
+
+    @staticmethod
+    def _chunk_id(text: str, indent: int, level: int) -> str:
+        """提取位于第`level`层的JSON对象编码结果中"id"字段的值, 仅用于匹配截取的片段, 找不到时返回空字符串"""
+        marker = "\n" + " " * (indent * (level + 1)) + '"id": "'
+        start = text.find(marker)
+        if start < 0:
+            return ""
+        start += len(marker)
+        return text[start:text.find('"', start)]
+
+    @profiling.timed
+    def save(self, *, indent: Optional[int] = 4, streaming: bool = False, incremental: bool = False) -> None:
         """保存草稿文件至打开时的路径, 仅在模板模式下可用
 
+        增量保存时, 未被修改过的导入素材及轨道直接复用上次保存(或加载文件)时的编码结果, 仅重新编码发生变化的部分,
+        故对大型模板的少量修改只需与修改量相称的编码时间. 文件本身仍会完整写入: 先写入临时文件再原子地替换原文件.
+        保存的内容与完整保存等价, 但不会更新`content`中的素材和轨道信息.
+
+        增量保存依赖于对修改的追踪: `replace_text`等方法会自动标记其修改的内容,
+        若直接修改了`imported_materials`中的素材或导入轨道, 则需调用`mark_dirty`进行标记.
+        此外, 编码结果的缓存会占用与草稿文件大小相当的内存.
+
+        Args:
+            indent (`int`, optional): 缩进空格数, 为None时不换行缩进. 默认为4.
+            streaming (`bool`, optional): 是否流式写入, 参见`dump`方法. 增量保存总是流式写入. 默认为否.
+            incremental (`bool`, optional): 是否增量保存. 默认为否.
+
         Raises:
             `ValueError`: 不在模板模式下
         """
         if self.save_path is None:
             raise ValueError("没有设置保存路径, 可能不在模板模式下")
-        self.dump(self.save_path)
+        if not incremental:
+            self.dump(self.save_path, indent=indent, streaming=streaming)
+            return
+
+        if not self._json_chunks and indent is not None and os.path.exists(self.save_path):
+            self._prime_json_chunks(self.save_path, indent)
+
+        temp_path = self.save_path + ".tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json_util.dump_stream(self._export_content_lazy(indent, incremental=True), f, indent=indent)
+        except BaseException:
+            if os.path.exists(temp_path):  # 不留下写了一半的临时文件
+                os.remove(temp_path)
+            raise
+        os.replace(temp_path, self.save_path)
+
+        # 只保留仍在草稿中的内容的缓存
+        alive = {id(mat) for material_list in self._imported_materials.values() for mat in material_list}
+        alive.update(id(track) for track in self.imported_tracks)
+        self._json_chunks = {key: value for key, value in self._json_chunks.items() if key in alive}
+        self._dirty_ids.clear()
@@ -1,12 +1,16 @@
 """定义片段基类及部分比较通用的属性类"""
 
-import uuid
-from typing import Optional, Dict, List, Any, Union
+from typing import Optional, Dict, List, Tuple, Iterable, Any, Union, TYPE_CHECKING
 
+from . import util
+from . import id_util
 from .animation import Segment_animations
 from .time_util import Timerange, tim
 from .keyframe import Keyframe_list, Keyframe_property
 
+if TYPE_CHECKING:
+    from .keyframe_curve import Keyframe_curve
+
 class Base_segment:
     """片段基类"""
 
@@ -17,15 +21,26 @@ class Base_segment:
     target_timerange: Timerange
     """片段在轨道上的时间范围"""
 
-    common_keyframes: List[Keyframe_list]
-    """各属性的关键帧列表"""
+    common_keyframes: Dict[Keyframe_property, Keyframe_list]
+    """各属性的关键帧列表, 以属性为键, 按首次添加的顺序排列"""
+
+    _export_cache: Optional[Tuple[Tuple[Any, ...], Dict[str, Any]]]
+    """上次导出时的片段状态及导出结果"""
 
     def __init__(self, material_id: str, target_timerange: Timerange):
-        self.segment_id = uuid.uuid4().hex
+        self.segment_id = id_util.new_id()
         self.material_id = material_id
         self.target_timerange = target_timerange
 
-        self.common_keyframes = []
+        self.common_keyframes = {}
+        self._export_cache = None
+
+    def _get_keyframe_list(self, _property: Keyframe_property) -> Keyframe_list:
+        """获取给定属性的关键帧列表, 不存在时创建之"""
+        kf_list = self.common_keyframes.get(_property)
+        if kf_list is None:
+            kf_list = self.common_keyframes[_property] = Keyframe_list(_property)
+        return kf_list
 
     @property
     def start(self) -> int:
@@ -52,6 +67,35 @@ class Base_segment:
         """判断是否与另一个片段有重叠"""
         return self.target_timerange.overlaps(other.target_timerange)
 
+    def _export_state(self) -> Tuple[Any, ...]:
+        """返回决定`export_json`结果的全部状态, 状态不变时导出结果也不变
+
+        子类若在`export_json`中导出了新的可变属性, 应在此方法中一并返回
+        """
+        return (self.segment_id, self.material_id, self.target_timerange.start, self.target_timerange.duration,
+                tuple((kf_list, kf_list.keyframe_property, kf_list.list_id, kf_list._version)
+                      for kf_list in self.common_keyframes.values()))
+
+    def export_json_cached(self) -> Dict[str, Any]:
+        """与`export_json`相同, 但片段状态自上次调用以来未发生变化时, 直接返回上次的导出结果
+
+        返回的字典可能被后续调用共享, 不应修改. 直接修改关键帧对象(而非通过`add_keyframe`等方法)不会被察觉,
+        此时需调用`invalidate_export_cache`
+        """
+        state = self._export_state()
+        if self._export_cache is not None and self._export_cache[0] == state:
+            util.export_cache_stats.hits += 1
+            return self._export_cache[1]
+
+        util.export_cache_stats.misses += 1
+        json_dict = self.export_json()
+        self._export_cache = (state, json_dict)
+        return json_dict
+
+    def invalidate_export_cache(self) -> None:
+        """清除导出缓存, 下次导出时重新生成JSON数据"""
+        self._export_cache = None
+
     def export_json(self) -> Dict[str, Any]:
         """返回通用于各种片段的属性"""
         return {
@@ -72,20 +116,22 @@ class Base_segment:
             "material_id": self.material_id,
             "target_timerange": self.target_timerange.export_json(),
 
-            "common_keyframes": [kf_list.export_json() for kf_list in self.common_keyframes],
+            "common_keyframes": [kf_list.export_json() for kf_list in self.common_keyframes.values()],
             "keyframe_refs": [],  # 意义不明
         }
 
 class Speed:
     """播放速度对象, 目前只支持固定速度"""
 
+    __slots__ = ("global_id", "speed")
+
     global_id: str
     """全局id, 由程序自动生成"""
     speed: float
     """播放速度"""
 
     def __init__(self, speed: float):
-        self.global_id = uuid.uuid4().hex
+        self.global_id = id_util.new_id()
         self.speed = speed
 
     def export_json(self) -> Dict[str, Any]:
@@ -100,6 +146,9 @@ class Speed:
 class Clip_settings:
     """素材片段的图像调节设置"""
 
+    __slots__ = ("alpha", "flip_horizontal", "flip_vertical", "rotation",
+                 "scale_x", "scale_y", "transform_x", "transform_y")
+
     alpha: float
     """图像不透明度, 0-1"""
     flip_horizontal: bool
@@ -173,6 +222,12 @@ class Media_segment(Base_segment):
 
         self.extra_material_refs = [self.speed.global_id]
 
+    def _export_state(self) -> Tuple[Any, ...]:
+        source = self.source_timerange
+        return super()._export_state() + (
+            (source.start, source.duration) if source else None,
+            self.speed.speed, self.volume, tuple(self.extra_material_refs))
+
     def export_json(self) -> Dict[str, Any]:
         """返回通用于音频和视频片段的默认属性"""
         ret = super().export_json()
@@ -228,23 +283,57 @@ class Visual_segment(Media_segment):
         Raises:
             `ValueError`: 试图同时设置`uniform_scale`以及`scale_x`或`scale_y`其中一者
         """
+        _property = self._resolve_keyframe_property(_property)
+        if isinstance(time_offset, str): time_offset = tim(time_offset)
+
+        self._get_keyframe_list(_property).add_keyframe(time_offset, value)
+        return self
+
+    def add_keyframes(self, _property: Keyframe_property,
+                      keyframes: Iterable[Tuple[Union[int, str], float]]) -> "Visual_segment":
+        """为给定属性批量创建关键帧, 结果与依次调用`add_keyframe`相同, 但在关键帧数量较多时快得多
+
+        Args:
+            _property (`Keyframe_property`): 要控制的属性
+            keyframes (`Iterable[Tuple[int | str, float]]`): 一系列(时间偏移量, 属性值)对, 时间偏移量的含义同`add_keyframe`
+
+        Raises:
+            `ValueError`: 试图同时设置`uniform_scale`以及`scale_x`或`scale_y`其中一者
+        """
+        _property = self._resolve_keyframe_property(_property)
+        self._get_keyframe_list(_property).add_keyframes(
+            (tim(time_offset) if isinstance(time_offset, str) else time_offset, value)
+            for time_offset, value in keyframes)
+        return self
+
+    def set_keyframe_curve(self, curve: "Keyframe_curve") -> "Visual_segment":
+        """以给定的关键帧曲线作为其属性的关键帧列表, 替换该属性原有的全部关键帧
+
+        Args:
+            curve (`Keyframe_curve`): 关键帧曲线, 通常已经过`resample`或`simplify`处理
+
+        Raises:
+            `ValueError`: 试图同时设置`uniform_scale`以及`scale_x`或`scale_y`其中一者
+        """
+        curve.keyframe_property = self._resolve_keyframe_property(curve.keyframe_property)
+        self.common_keyframes[curve.keyframe_property] = curve
+        return self
+
+    def _resolve_keyframe_property(self, _property: Keyframe_property) -> Keyframe_property:
+        """处理`uniform_scale`与`scale_x`/`scale_y`的互斥关系, 返回实际写入的属性"""
         if (_property == Keyframe_property.scale_x or _property == Keyframe_property.scale_y) and self.uniform_scale:
             self.uniform_scale = False
         elif _property == Keyframe_property.uniform_scale:
             if not self.uniform_scale:
                 raise ValueError("已设置 scale_x 或 scale_y 时, 不能再设置 uniform_scale")
             _property = Keyframe_property.scale_x
+        return _property
 
-        if isinstance(time_offset, str): time_offset = tim(time_offset)
-
-        for kf_list in self.common_keyframes:
-            if kf_list.keyframe_property == _property:
-                kf_list.add_keyframe(time_offset, value)
-                return self
-        kf_list = Keyframe_list(_property)
-        kf_list.add_keyframe(time_offset, value)
-        self.common_keyframes.append(kf_list)
-        return self
+    def _export_state(self) -> Tuple[Any, ...]:
+        clip = self.clip_settings
+        return super()._export_state() + (
+            clip.alpha, clip.flip_horizontal, clip.flip_vertical, clip.rotation,
+            clip.scale_x, clip.scale_y, clip.transform_x, clip.transform_y, self.uniform_scale)
 
     def export_json(self) -> Dict[str, Any]:
         """导出通用于所有视觉片段的JSON数据"""
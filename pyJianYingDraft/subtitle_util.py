@@ -0,0 +1,122 @@
+"""SRT及WebVTT字幕文件的流式解析, 逐条给出字幕而无需一次性读入整个文件"""
+
+import re
+import html
+import itertools
+
+from typing import Iterable, Iterator, List, Optional
+
+from .time_util import Timerange, srt_tstamp, vtt_tstamp
+
+_VTT_TAG = re.compile(r"<[^>]*>")
+"""WebVTT字幕内容中的标签, 如`<b>`, `<v 说话人>`及时间戳标签"""
+
+class Subtitle_cue:
+    """一条字幕"""
+
+    __slots__ = ("timerange", "text")
+
+    timerange: Timerange
+    """字幕的时间范围"""
+    text: str
+    """字幕内容, 多行时以换行符分隔"""
+
+    def __init__(self, timerange: Timerange, text: str):
+        self.timerange = timerange
+        self.text = text
+
+    def __repr__(self) -> str:
+        return "Subtitle_cue(%r, %r)" % (self.timerange, self.text)
+
+def iter_srt_cues(lines: Iterable[str]) -> Iterator[Subtitle_cue]:
+    """逐条解析SRT格式的字幕
+
+    Args:
+        lines (`Iterable[str]`): 字幕文件的各行, 如打开的文件对象
+
+    Raises:
+        `ValueError`: 字幕序号或时间戳格式错误
+    """
+    text = ""
+    timerange: Optional[Timerange] = None
+    read_state = "index"
+    for line_no, line in enumerate(lines, 1):
+        line = line.strip()
+        if read_state == "index":
+            if len(line) == 0:
+                continue
+            if not line.isdigit():
+                raise ValueError("Expected a number at line %d, got '%s'" % (line_no, line))
+            read_state = "timestamp"
+        elif read_state == "timestamp":
+            start_str, end_str = line.split(" --> ")
+            start, end = srt_tstamp(start_str), srt_tstamp(end_str.split()[0])  # 忽略结束时间后可能存在的坐标信息
+            timerange = Timerange(start, end - start)
+            read_state = "content"
+        elif len(line) == 0:  # 内容结束
+            assert timerange is not None
+            yield Subtitle_cue(timerange, text.strip())
+            text = ""
+            read_state = "index"
+        else:
+            text += line + "\n"
+
+    # 最后一条字幕
+    if len(text) > 0:
+        assert timerange is not None
+        yield Subtitle_cue(timerange, text.strip())
+
+def iter_vtt_cues(lines: Iterable[str]) -> Iterator[Subtitle_cue]:
+    """逐条解析WebVTT格式的字幕, 跳过注释、样式及区域定义块, 并去除字幕内容中的标签
+
+    Args:
+        lines (`Iterable[str]`): 字幕文件的各行, 如打开的文件对象
+
+    Raises:
+        `ValueError`: 文件不以`WEBVTT`开头, 或时间戳格式错误
+    """
+    line_iter = iter(lines)
+    if not next(line_iter, "").lstrip("\ufeff").startswith("WEBVTT"):
+        raise ValueError("WebVTT文件应以'WEBVTT'开头")
+
+    block: List[str] = []
+    for line in itertools.chain(line_iter, [""]):  # 末尾补充空行以结束最后一个块
+        line = line.strip()
+        if len(line) > 0:
+            block.append(line)
+            continue
+        if block:
+            cue = _parse_vtt_block(block)
+            if cue is not None:
+                yield cue
+            block = []
+
+def _parse_vtt_block(block: List[str]) -> Optional[Subtitle_cue]:
+    """解析WebVTT中的一个块, 不是字幕(如文件头、注释)时返回None"""
+    if block[0].startswith(("NOTE", "STYLE", "REGION")):
+        return None
+    timing_index = next((i for i, line in enumerate(block[:2]) if "-->" in line), None)  # 时间戳前可能有一行标识符
+    if timing_index is None:
+        return None
+
+    start_str, end_str = block[timing_index].split("-->", 1)
+    start, end = vtt_tstamp(start_str.strip()), vtt_tstamp(end_str.split()[0])  # 忽略结束时间后的字幕设置
+    text = "\n".join(html.unescape(_VTT_TAG.sub("", line)) for line in block[timing_index + 1:])
+    return Subtitle_cue(Timerange(start, end - start), text.strip())
+
+def iter_subtitle_cues(path: str) -> Iterator[Subtitle_cue]:
+    """逐条读取SRT或WebVTT字幕文件, 以文件是否以`WEBVTT`开头判断格式
+
+    Args:
+        path (`str`): 字幕文件路径
+
+    Raises:
+        `ValueError`: 字幕格式错误
+    """
+    with open(path, "r", encoding="utf-8-sig") as f:
+        first_line = f.readline()
+        lines = itertools.chain([first_line], f)
+        if first_line.startswith("WEBVTT"):
+            yield from iter_vtt_cues(lines)
+        else:
+            yield from iter_srt_cues(lines)
@@ -3,14 +3,17 @@
 from enum import Enum
 from copy import deepcopy
 
+import re
+
 from . import util
+from . import json_util
 from . import exceptions
 from .time_util import Timerange
 from .segment import Base_segment
 from .track import Base_track, Track_type
 from .local_materials import Video_material, Audio_material
 
-from typing import List, Dict, Any
+from typing import List, Dict, Tuple, Iterator, Optional, Union, Any
 
 class Shrink_mode(Enum):
     """处理替换素材时素材变短情况的方法"""
@@ -40,20 +43,40 @@ class Extend_mode(Enum):
     push_tail = "push_tail"
     """延伸尾部, 若有必要则依次后移后续片段, 此方法总是成功"""
 
+_IMMUTABLE_TYPES = (str, int, float, bool, type(None))
+"""无需深拷贝的属性值类型"""
+
+def _deepcopy_sharing_raw_data(obj: Any, memo: Dict[int, Any]) -> Any:
+    """深拷贝导入的轨道或片段, 但与原对象共享(只读的)原始json数据"""
+    cls = obj.__class__
+    new_obj = cls.__new__(cls)
+    memo[id(obj)] = new_obj
+    for key, value in obj.__dict__.items():
+        if key not in ("raw_data", "_pending") and not isinstance(value, _IMMUTABLE_TYPES):
+            value = deepcopy(value, memo)
+        setattr(new_obj, key, value)
+    return new_obj
+
 class ImportedSegment(Base_segment):
     """导入的片段"""
 
     raw_data: Dict[str, Any]
-    """原始json数据"""
+    """原始json数据, 与加载的草稿内容共享, 视为只读
+
+    对片段的修改记录在相应属性中, 导出时再覆盖到原始数据的副本上
+    """
 
     __DATA_ATTRS = ["material_id", "target_timerange"]
     def __init__(self, json_data: Dict[str, Any]):
-        self.raw_data = deepcopy(json_data)
+        self.raw_data = json_data
 
         util.assign_attr_with_json(self, self.__DATA_ATTRS, json_data)
 
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "ImportedSegment":
+        return _deepcopy_sharing_raw_data(self, memo)
+
     def export_json(self) -> Dict[str, Any]:
-        json_data = deepcopy(self.raw_data)
+        json_data = dict(self.raw_data)  # 顶层的键会被覆盖, 故浅拷贝即可
         json_data.update(util.export_attr_to_json(self, self.__DATA_ATTRS))
         return json_data
 
@@ -79,7 +102,12 @@ class ImportedTrack(Base_track):
     """模板模式下导入的轨道"""
 
     raw_data: Dict[str, Any]
-    """原始轨道数据"""
+    """原始轨道数据, 与加载的草稿内容共享, 视为只读"""
+
+    _pending: Union[json_util.Encoded_json, Dict[str, Any]]
+    """延迟加载的轨道尚未解析的原始数据(编码结果或JSON数据), 解析后即被删除"""
+    _pending_header: Tuple[str, str, int]
+    """延迟加载时轨道的名称、id及渲染层级, 用于判断轨道是否被修改过"""
 
     def __init__(self, json_data: Dict[str, Any]):
         self.track_type = Track_type.from_name(json_data["type"])
@@ -87,10 +115,40 @@ class ImportedTrack(Base_track):
         self.track_id = json_data["id"]
         self.render_index = max([int(seg["render_index"]) for seg in json_data["segments"]], default=0)
 
-        self.raw_data = deepcopy(json_data)
+        self._load_data(json_data)
+
+    def _load_data(self, json_data: Dict[str, Any]) -> None:
+        """由原始数据构造轨道内容"""
+        self.raw_data = json_data
+
+    def __getattr__(self, name: str) -> Any:
+        # 延迟加载的轨道在首次访问原始数据或片段时才被解析
+        pending = self.__dict__.get("_pending")
+        if pending is None or name not in ("raw_data", "segments"):
+            raise AttributeError("'%s' object has no attribute '%s'" % (type(self).__name__, name))
+        del self._pending
+        self._load_data(json_util.loads(pending.text) if isinstance(pending, json_util.Encoded_json) else pending)
+        return getattr(self, name)
+
+    @property
+    def pending(self) -> bool:
+        """轨道是否为延迟加载且尚未被解析"""
+        return "_pending" in self.__dict__
+
+    def pending_json(self, indent: Optional[int]) -> Optional[json_util.Encoded_json]:
+        """若轨道尚未被解析且未被修改, 返回其在草稿文件中的原始编码结果, 缩进与`indent`不一致时返回None"""
+        pending = self.__dict__.get("_pending")
+        if not isinstance(pending, json_util.Encoded_json) or pending.indent != indent:
+            return None
+        if self._pending_header != (self.name, self.track_id, self.render_index):
+            return None
+        return pending
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "ImportedTrack":
+        return _deepcopy_sharing_raw_data(self, memo)
 
     def export_json(self) -> Dict[str, Any]:
-        ret = deepcopy(self.raw_data)
+        ret = dict(self.raw_data)  # 顶层的键会被覆盖, 故浅拷贝即可
         ret.update({
             "name": self.name,
             "id": self.track_id
@@ -121,19 +179,27 @@ class EditableTrack(ImportedTrack):
         return self.segments[-1].target_timerange.end
 
     def export_json(self) -> Dict[str, Any]:
+        ret = self.export_json_lazy()
+        ret["segments"] = list(ret["segments"])
+        return ret
+
+    def export_json_lazy(self) -> Dict[str, Any]:
         ret = super().export_json()
-        # 为每个片段写入render_index
-        segment_exports = [seg.export_json() for seg in self.segments]
-        for seg in segment_exports:
-            seg["render_index"] = self.render_index
-        ret["segments"] = segment_exports
+        ret["segments"] = self._export_segments()
         return ret
 
+    def _export_segments(self) -> Iterator[Dict[str, Any]]:
+        """逐个导出片段, 并为每个片段写入render_index"""
+        for seg in self.segments:
+            seg_json = seg.export_json()
+            seg_json["render_index"] = self.render_index
+            yield seg_json
+
 class ImportedTextTrack(EditableTrack):
     """模板模式下导入的文本轨道"""
 
-    def __init__(self, json_data: Dict[str, Any]):
-        super().__init__(json_data)
+    def _load_data(self, json_data: Dict[str, Any]) -> None:
+        super()._load_data(json_data)
         self.segments = [ImportedSegment(seg) for seg in json_data["segments"]]
 
 class ImportedMediaTrack(EditableTrack):
@@ -142,8 +208,8 @@ class ImportedMediaTrack(EditableTrack):
     segments: List[ImportedMediaSegment]
     """该轨道包含的片段列表"""
 
-    def __init__(self, json_data: Dict[str, Any]):
-        super().__init__(json_data)
+    def _load_data(self, json_data: Dict[str, Any]) -> None:
+        super()._load_data(json_data)
         self.segments = [ImportedMediaSegment(seg) for seg in json_data["segments"]]
 
     def check_material_type(self, material: object) -> bool:
@@ -211,11 +277,56 @@ class ImportedMediaTrack(EditableTrack):
         # 写入素材时间范围
         seg.source_timerange = src_timerange
 
-def import_track(json_data: Dict[str, Any]) -> ImportedTrack:
-    """导入轨道"""
-    track_type = Track_type.from_name(json_data["type"])
+def _track_class(track_type: Track_type) -> type:
     if not track_type.value.allow_modify:
-        return ImportedTrack(json_data)
+        return ImportedTrack
     if track_type == Track_type.text:
-        return ImportedTextTrack(json_data)
-    return ImportedMediaTrack(json_data)
+        return ImportedTextTrack
+    return ImportedMediaTrack
+
+def import_track(json_data: Dict[str, Any]) -> ImportedTrack:
+    """导入轨道"""
+    return _track_class(Track_type.from_name(json_data["type"]))(json_data)
+
+def import_track_lazy(data: Union[json_util.Encoded_json, Dict[str, Any]]) -> ImportedTrack:
+    """延迟导入轨道, 只读取轨道的类型、名称、id及渲染层级, 原始数据及片段在首次访问时才被解析
+
+    Args:
+        data (`Encoded_json` or `Dict[str, Any]`): 轨道的JSON数据, 或其在草稿文件中位于第2层的带缩进编码结果
+
+    Raises:
+        `ValueError`: 编码结果不符合缩进格式
+    """
+    if isinstance(data, json_util.Encoded_json):
+        header, render_index = _peek_track(data)
+    else:
+        header = data
+        render_index = max([int(seg["render_index"]) for seg in data["segments"]], default=0)
+
+    track_type = Track_type.from_name(header["type"])
+    cls = _track_class(track_type)
+    track = cls.__new__(cls)
+    track.track_type = track_type
+    track.name = header["name"]
+    track.track_id = header["id"]
+    track.render_index = render_index
+    track._pending = data
+    track._pending_header = (track.name, track.track_id, track.render_index)
+    return track
+
+def _peek_track(encoded: json_util.Encoded_json) -> Tuple[Dict[str, Any], int]:
+    """从轨道的编码结果中读取除片段外的各字段, 以及各片段渲染层级的最大值"""
+    assert encoded.indent is not None
+    fields = json_util.split_indented(encoded.text, encoded.indent, encoded.level)
+    if fields is None:
+        raise ValueError("轨道数据不符合缩进格式")
+    header: Dict[str, Any] = {}
+    render_index = 0
+    for key, text in fields:
+        if key != "segments":
+            header[key] = json_util.loads(text)
+            continue
+        # 各片段的字段位于轨道下两层, 字符串中的换行符总会被转义, 故以换行及缩进为前缀的匹配不会误报
+        prefix = "\n" + " " * (encoded.indent * (encoded.level + 3)) + '"render_index": '
+        render_index = max(map(int, re.findall(re.escape(prefix) + r"(-?[0-9]+)", text)), default=0)
+    return header, render_index
@@ -1,18 +1,21 @@
 """定义文本片段及其相关类"""
 
-import json
-import uuid
 from copy import deepcopy
 
 from typing import Dict, Tuple, Any
-from typing import Union, Optional, Literal
+from typing import Union, Optional, Literal, TYPE_CHECKING
 
+from . import id_util
+from . import json_util
+from . import profiling
 from .time_util import Timerange, tim
 from .segment import Clip_settings, Visual_segment
 from .animation import Segment_animations, Text_animation
 
-from .metadata import Font_type, Effect_meta
-from .metadata import Text_intro, Text_outro, Text_loop_anim
+from .metadata import Effect_meta
+if TYPE_CHECKING:
+    from .metadata import Font_type
+    from .metadata import Text_intro, Text_outro, Text_loop_anim
 
 class Text_style:
     """字体样式类"""
@@ -174,7 +177,7 @@ class TextBubble:
     resource_id: str
 
     def __init__(self, effect_id: str, resource_id: str):
-        self.global_id = uuid.uuid4().hex
+        self.global_id = id_util.new_id()
         self.effect_id = effect_id
         self.resource_id = resource_id
 
@@ -198,6 +201,14 @@ class TextEffect(TextBubble):
         ret["source_platform"] = 1
         return ret
 
+_CONTENT_TEMPLATE_LIMIT = 1024
+"""文本素材content编码模板的最大缓存数量, 超出时清空缓存"""
+_RANGE_PLACEHOLDER = 998244353998244353
+"""生成编码模板时代替文本长度的占位数字"""
+
+_content_templates: Dict[str, Tuple[str, str]] = {}
+"""文本素材content的编码模板, 以决定样式的各参数(的repr)为键, 值为文本长度前、后的两段编码结果"""
+
 class Text_segment(Visual_segment):
     """文本片段类, 目前仅支持设置基本的字体样式"""
 
@@ -218,8 +229,9 @@ class Text_segment(Visual_segment):
     effect: Optional[TextEffect]
     """文本花字效果, 在放入轨道时加入素材列表中, 目前仅支持一部分花字效果"""
 
+    @profiling.timed
     def __init__(self, text: str, timerange: Timerange, *,
-                 font: Optional[Font_type] = None,
+                 font: Optional["Font_type"] = None,
                  style: Optional[Text_style] = None, clip_settings: Optional[Clip_settings] = None,
                  border: Optional[Text_border] = None, background: Optional[Text_background] = None):
         """创建文本片段, 并指定其时间信息、字体样式及图像调节设置
@@ -235,7 +247,7 @@ class Text_segment(Visual_segment):
             border (`Text_border`, optional): 文本描边参数, 默认无描边
             background (`Text_background`, optional): 文本背景参数, 默认无背景
         """
-        super().__init__(uuid.uuid4().hex, None, timerange, 1.0, 1.0, clip_settings=clip_settings)
+        super().__init__(id_util.new_id(), None, timerange, 1.0, 1.0, clip_settings=clip_settings)
 
         self.text = text
         self.font = font.value if font else None
@@ -256,7 +268,7 @@ class Text_segment(Visual_segment):
         # 处理动画等
         if template.animations_instance:
             new_segment.animations_instance = deepcopy(template.animations_instance)
-            new_segment.animations_instance.animation_id = uuid.uuid4().hex
+            new_segment.animations_instance.animation_id = id_util.new_id()
             new_segment.extra_material_refs.append(new_segment.animations_instance.animation_id)
         if template.bubble:
             new_segment.add_bubble(template.bubble.effect_id, template.bubble.resource_id)
@@ -265,7 +277,7 @@ class Text_segment(Visual_segment):
 
         return new_segment
 
-    def add_animation(self, animation_type: Union[Text_intro, Text_outro, Text_loop_anim],
+    def add_animation(self, animation_type: Union["Text_intro", "Text_outro", "Text_loop_anim"],
                       duration: Union[str, float] = 500000) -> "Text_segment":
         """将给定的入场/出场/循环动画添加到此片段的动画列表中, 出入场动画的持续时间可以自行设置, 循环动画则会自动填满其余无动画部分
 
@@ -278,6 +290,7 @@ class Text_segment(Visual_segment):
         """
         duration = min(tim(duration), self.target_timerange.duration)
 
+        from .metadata import Text_intro, Text_outro, Text_loop_anim
         if isinstance(animation_type, Text_intro):
             start = 0
         elif isinstance(animation_type, Text_outro):
@@ -319,15 +332,29 @@ class Text_segment(Visual_segment):
         self.extra_material_refs.append(self.effect.global_id)
         return self
 
-    def export_material(self) -> Dict[str, Any]:
-        """与此文本片段联系的素材, 以此不再单独定义Text_material类"""
-        # 叠加各类效果的flag
-        check_flag: int = 7
-        if self.border:
-            check_flag |= 8
-        if self.background:
-            check_flag |= 16
+    def _export_content(self) -> str:
+        """导出文本素材的content字段, 即编码为JSON字符串的文本及样式
 
+        样式部分的编码结果按样式参数缓存, 样式相同的大量文本(如字幕)只需拼接文本长度及文本本身
+        """
+        style, border = self.style, self.border
+        # 各部分之间以None分隔; 以各值的repr为键, 因为如`1`与`1.0`、`0.0`与`-0.0`相等但编码结果不同
+        values = (style.alpha, style.size, style.bold, style.italic, style.underline, *style.color, None,
+                  *(() if border is None else (border.alpha, border.width, *border.color)), None,
+                  *(() if self.font is None else (self.font.resource_id, self.font.name)), None,
+                  *(() if self.effect is None else (self.effect.effect_id,)))
+        key = repr(values)
+        template = _content_templates.get(key)
+        if template is None:
+            if len(_content_templates) >= _CONTENT_TEMPLATE_LIMIT:
+                _content_templates.clear()
+            template = _content_templates[key] = self._build_content_template()
+
+        head, tail = template
+        return head + str(len(self.text)) + tail + json_util.dumps_str(self.text) + "}"
+
+    def _build_content_template(self) -> Tuple[str, str]:
+        """编码content中与文本内容无关的部分, 返回文本长度前、后的两段编码结果"""
         content_json = {
             "styles": [
                 {
@@ -341,7 +368,7 @@ class Text_segment(Visual_segment):
                             }
                         }
                     },
-                    "range": [0, len(self.text)],
+                    "range": [0, _RANGE_PLACEHOLDER],
                     "size": self.style.size,
                     "bold": self.style.bold,
                     "italic": self.style.italic,
@@ -349,7 +376,7 @@ class Text_segment(Visual_segment):
                     "strokes": [self.border.export_json()] if self.border else []
                 }
             ],
-            "text": self.text
+            "text": ""
         }
         if self.font:
             content_json["styles"][0]["font"] = {
@@ -362,9 +389,24 @@ class Text_segment(Visual_segment):
                 "path": "C:"  # 并不会真正在此处放置素材文件
             }
 
+        encoded = json_util.dumps(content_json)
+        marker = '"range": [0, %d]' % _RANGE_PLACEHOLDER  # 字符串中的引号会被转义, 故此标记只可能出现在range字段处
+        head, tail = encoded.split(marker)
+        assert tail.endswith('""}')
+        return head + '"range": [0, ', "]" + tail[:-len('""}')]
+
+    def export_material(self) -> Dict[str, Any]:
+        """与此文本片段联系的素材, 以此不再单独定义Text_material类"""
+        # 叠加各类效果的flag
+        check_flag: int = 7
+        if self.border:
+            check_flag |= 8
+        if self.background:
+            check_flag |= 16
+
         ret = {
             "id": self.material_id,
-            "content": json.dumps(content_json, ensure_ascii=False),
+            "content": self._export_content(),
 
             "typesetting": int(self.style.vertical),
             "alignment": self.style.align,
@@ -1,7 +1,7 @@
 """定义时间范围类以及与时间相关的辅助函数"""
 
 from typing import Union
-from typing import Dict
+from typing import Dict, Any
 
 SEC = 1000000
 """一秒=1e6微秒"""
@@ -33,6 +33,9 @@ def tim(inp: Union[str, float]) -> int:
 
 class Timerange:
     """记录了起始时间及持续长度的时间范围"""
+
+    __slots__ = ("start", "duration")
+
     start: int
     """起始时间, 单位为微秒"""
     duration: int
@@ -59,6 +62,12 @@ class Timerange:
         """结束时间, 单位为微秒"""
         return self.start + self.duration
 
+    def __copy__(self) -> "Timerange":
+        return Timerange(self.start, self.duration)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "Timerange":
+        return Timerange(self.start, self.duration)  # 两个属性均为整数, 无需递归复制
+
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Timerange):
             return False
@@ -97,3 +106,12 @@ def srt_tstamp(srt_tstamp: str) -> int:
     for value, factor in zip(parts, [3600*SEC, 60*SEC, SEC, 1000]):
         total_time += int(value) * factor
     return total_time
+
+def vtt_tstamp(vtt_tstamp: str) -> int:
+    """解析WebVTT中的时间戳字符串(形如`hh:mm:ss.ttt`或`mm:ss.ttt`), 返回微秒数"""
+    sec_str, ms_str = vtt_tstamp.split(".")
+    parts = sec_str.split(":")
+    if len(parts) == 2:
+        parts.insert(0, "0")
+    hours, minutes, seconds = parts
+    return int(hours) * 3600*SEC + int(minutes) * 60*SEC + int(seconds) * SEC + int(ms_str) * 1000
@@ -1,13 +1,13 @@
 """轨道类及其元数据"""
 
-import uuid
-
 from enum import Enum
 from typing import TypeVar, Generic, Type
-from typing import Dict, List, Any, Union
+from typing import Dict, List, Any, Union, Iterable, Iterator
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
 
+from . import id_util
+from . import profiling
 from .exceptions import SegmentOverlap
 from .segment import Base_segment
 from .video_segment import Video_segment, Sticker_segment
@@ -68,6 +68,10 @@ class Base_track(ABC):
     @abstractmethod
     def export_json(self) -> Dict[str, Any]: ...
 
+    def export_json_lazy(self) -> Dict[str, Any]:
+        """与`export_json`相同, 但片段列表(若有)以迭代器形式给出, 供流式写入使用"""
+        return self.export_json()
+
 Seg_type = TypeVar("Seg_type", bound=Base_segment)
 class Track(Base_track, Generic[Seg_type]):
     """非模板模式下的轨道"""
@@ -76,12 +80,15 @@ class Track(Base_track, Generic[Seg_type]):
     """是否静音"""
 
     segments: List[Seg_type]
-    """该轨道包含的片段列表"""
+    """该轨道包含的片段列表, 按片段的起止时间排序
+
+    片段放入轨道后不应再修改其`target_timerange`, 否则可能破坏排序而导致重叠检测失效
+    """
 
     def __init__(self, track_type: Track_type, name: str, render_index: int, mute: bool):
         self.track_type = track_type
         self.name = name
-        self.track_id = uuid.uuid4().hex
+        self.track_id = id_util.new_id()
         self.render_index = render_index
 
         self.mute = mute
@@ -99,6 +106,7 @@ class Track(Base_track, Generic[Seg_type]):
         """返回该轨道允许的片段类型"""
         return self.track_type.value.segment_type  # type: ignore
 
+    @profiling.timed
     def add_segment(self, segment: Seg_type) -> "Track[Seg_type]":
         """向轨道中添加一个片段, 添加的片段必须匹配轨道类型且不与现有片段重叠
 
@@ -112,27 +120,75 @@ class Track(Base_track, Generic[Seg_type]):
         if not isinstance(segment, self.accept_segment_type):
             raise TypeError("New segment (%s) is not of the same type as the track (%s)" % (type(segment), self.accept_segment_type))
 
-        # 检查片段是否重叠
-        for seg in self.segments:
+        # 已有片段互不重叠且按(起始, 结束)排序, 故其结束时间同样单调不减, 只需检查插入位置附近的片段
+        index = self._bisect_segment(segment)
+        lo, hi = index, index
+        while lo > 0 and self.segments[lo - 1].end > segment.start:
+            lo -= 1
+        while hi < len(self.segments) and self.segments[hi].start < segment.end:
+            hi += 1
+        for seg in self.segments[lo:hi]:
             if seg.overlaps(segment):
                 raise SegmentOverlap("New segment overlaps with existing segment [start: {}, end: {}]"
                                      .format(segment.target_timerange.start, segment.target_timerange.end))
 
-        self.segments.append(segment)
+        self.segments.insert(index, segment)
+        return self
+
+    @profiling.timed
+    def add_segments(self, segments: Iterable[Seg_type]) -> "Track[Seg_type]":
+        """批量添加片段, 按时间顺序给出的片段直接追加至轨道末尾, 故总耗时与片段数量成线性关系
+
+        不按时间顺序给出的片段则与`add_segment`一样插入到相应位置
+
+        Args:
+            segments (`Iterable[Seg_type]`): 要添加的片段, 可以是生成器
+
+        Raises:
+            `TypeError`: 片段类型与轨道类型不匹配
+            `SegmentOverlap`: 片段与现有片段重叠, 此前的片段已被添加
+        """
+        accept_type = self.accept_segment_type
+        for segment in segments:
+            # 已有片段的结束时间单调不减, 新片段不早于最后一个片段的结束时即不会与任何片段重叠
+            if self.segments and self.segments[-1].end <= segment.start and isinstance(segment, accept_type):
+                self.segments.append(segment)
+            else:
+                self.add_segment(segment)
         return self
 
+    def _bisect_segment(self, segment: Seg_type) -> int:
+        """以(起始时间, 结束时间)为键, 二分查找片段在`segments`中的插入位置(置于相同键值的片段之后)"""
+        key = (segment.start, segment.end)
+        lo, hi = 0, len(self.segments)
+        # 大部分情况下片段按时间顺序添加, 直接置于末尾
+        if hi == 0 or (self.segments[-1].start, self.segments[-1].end) <= key:
+            return hi
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if key < (self.segments[mid].start, self.segments[mid].end):
+                hi = mid
+            else:
+                lo = mid + 1
+        return lo
+
     def export_json(self) -> Dict[str, Any]:
-        # 为每个片段写入render_index
-        segment_exports = [seg.export_json() for seg in self.segments]
-        for seg in segment_exports:
-            seg["render_index"] = self.render_index
+        ret = self.export_json_lazy()
+        ret["segments"] = list(ret["segments"])
+        return ret
 
+    def export_json_lazy(self) -> Dict[str, Any]:
         return {
             "attribute": int(self.mute),
             "flag": 0,
             "id": self.track_id,
             "is_default_name": len(self.name) == 0,
             "name": self.name,
-            "segments": segment_exports,
+            "segments": self._export_segments(),
             "type": self.track_type.name
         }
+
+    def _export_segments(self) -> Iterator[Dict[str, Any]]:
+        """逐个导出片段, 并为每个片段写入render_index"""
+        for seg in self.segments:
+            yield {**seg.export_json_cached(), "render_index": self.render_index}
@@ -2,6 +2,8 @@
 
 import inspect
 
+from functools import lru_cache
+
 from typing import Union, Type
 from typing import List, Dict, Any
 
@@ -28,16 +30,21 @@ def provide_ctor_defaults(cls: Type) -> Dict[str, Any]:
 
     return provided_defaults
 
+@lru_cache(maxsize=None)
+def _collect_type_hints(cls: Type) -> Dict[str, Type]:
+    """收集类及其基类中的属性类型注解, 结果按类缓存"""
+    type_hints: Dict[str, Type] = {}
+    for base in cls.__mro__:
+        if '__annotations__' in base.__dict__:
+            type_hints.update(base.__annotations__)
+    return type_hints
+
 def assign_attr_with_json(obj: object, attrs: List[str], json_data: Dict[str, Any]):
     """根据json数据赋值给指定的对象属性
 
     若有复杂类型，则尝试调用其`import_json`方法进行构造
     """
-    type_hints: Dict[str, Type] = {}
-    for cls in obj.__class__.__mro__:
-        if '__annotations__' in cls.__dict__:
-            type_hints.update(cls.__annotations__)
-
+    type_hints = _collect_type_hints(obj.__class__)
     for attr in attrs:
         if hasattr(type_hints[attr], 'import_json'):
             obj.__setattr__(attr, type_hints[attr].import_json(json_data[attr]))
@@ -56,3 +63,30 @@ def export_attr_to_json(obj: object, attrs: List[str]) -> Dict[str, JsonExportab
         else:
             json_data[attr] = getattr(obj, attr)
     return json_data
+
+class Export_cache_stats:
+    """片段及素材导出缓存的命中统计"""
+
+    hits: int
+    """命中次数, 即直接返回了缓存的JSON数据的次数"""
+    misses: int
+    """未命中次数, 即重新生成JSON数据的次数"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        """清零统计数据"""
+        self.hits = 0
+        self.misses = 0
+
+    def as_dict(self) -> Dict[str, Union[int, float]]:
+        """以字典形式返回统计数据, 包括命中率`hit_rate`"""
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / total if total else 0.0}
+
+    def __repr__(self) -> str:
+        return f"Export_cache_stats(hits={self.hits}, misses={self.misses})"
+
+export_cache_stats = Export_cache_stats()
+"""全局的导出缓存命中统计"""
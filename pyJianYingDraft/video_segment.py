@@ -3,21 +3,22 @@
 包含图像调节设置、动画效果、特效、转场等相关类
 """
 
-import uuid
-from copy import deepcopy
-
-from typing import Optional, Literal, Union, overload
+from typing import Optional, Literal, Union, overload, TYPE_CHECKING
 from typing import Dict, List, Tuple, Any
 
+from . import id_util
+from . import profiling
 from .time_util import tim, Timerange
 from .segment import Visual_segment, Clip_settings
 from .local_materials import Video_material
 from .animation import Segment_animations, Video_animation
 
 from .metadata import Effect_meta, Effect_param_instance
-from .metadata import Mask_meta, Mask_type, Filter_type, Transition_type
-from .metadata import Intro_type, Outro_type, Group_animation_type
-from .metadata import Video_scene_effect_type, Video_character_effect_type
+from .metadata import Mask_meta, Mask_type
+if TYPE_CHECKING:
+    from .metadata import Filter_type, Transition_type
+    from .metadata import Intro_type, Outro_type, Group_animation_type
+    from .metadata import Video_scene_effect_type, Video_character_effect_type
 
 class Mask:
     """蒙版对象"""
@@ -46,7 +47,7 @@ class Mask:
                  cx: float, cy: float, w: float, h: float,
                  ratio: float, rot: float, inv: bool, feather: float, round_corner: float):
         self.mask_meta = mask_meta
-        self.global_id = uuid.uuid4().hex
+        self.global_id = id_util.new_id()
 
         self.center_x, self.center_y = cx, cy
         self.width, self.height = w, h
@@ -98,17 +99,18 @@ class Video_effect:
 
     adjust_params: List[Effect_param_instance]
 
-    def __init__(self, effect_meta: Union[Video_scene_effect_type, Video_character_effect_type],
+    def __init__(self, effect_meta: Union["Video_scene_effect_type", "Video_character_effect_type"],
                  params: Optional[List[Optional[float]]] = None, *,
                  apply_target_type: Literal[0, 2] = 0):
         """根据给定的特效元数据及参数列表构造一个视频特效对象, params的范围是0~100"""
 
         self.name = effect_meta.value.name
-        self.global_id = uuid.uuid4().hex
+        self.global_id = id_util.new_id()
         self.effect_id = effect_meta.value.effect_id
         self.resource_id = effect_meta.value.resource_id
         self.adjust_params = []
 
+        from .metadata import Video_scene_effect_type, Video_character_effect_type
         if isinstance(effect_meta, Video_scene_effect_type):
             self.effect_type = "video_effect"
         elif isinstance(effect_meta, Video_character_effect_type):
@@ -162,7 +164,7 @@ class Filter:
                  apply_target_type: Literal[0, 2] = 0):
         """根据给定的滤镜元数据及强度构造滤镜素材对象"""
 
-        self.global_id = uuid.uuid4().hex
+        self.global_id = id_util.new_id()
         self.effect_meta = meta
         self.intensity = intensity
         self.apply_target_type = apply_target_type
@@ -218,10 +220,10 @@ class Transition:
     is_overlap: bool
     """是否与上一个片段重叠(?)"""
 
-    def __init__(self, effect_meta: Transition_type, duration: Optional[int] = None):
+    def __init__(self, effect_meta: "Transition_type", duration: Optional[int] = None):
         """根据给定的转场元数据及持续时间构造一个转场对象"""
         self.name = effect_meta.value.name
-        self.global_id = uuid.uuid4().hex
+        self.global_id = id_util.new_id()
         self.effect_id = effect_meta.value.effect_id
         self.resource_id = effect_meta.value.resource_id
 
@@ -256,7 +258,7 @@ class BackgroundFilling:
     """背景颜色, 格式为'#RRGGBBAA'"""
 
     def __init__(self, fill_type: Literal["canvas_blur", "canvas_color"], blur: float, color: str):
-        self.global_id = uuid.uuid4().hex
+        self.global_id = id_util.new_id()
         self.fill_type = fill_type
         self.blur = blur
         self.color = color
@@ -274,7 +276,7 @@ class Video_segment(Visual_segment):
     """安放在轨道上的一个视频/图片片段"""
 
     material_instance: Video_material
-    """素材实例"""
+    """素材实例, 与其它使用同一素材的片段共享, 已被冻结"""
     material_size: Tuple[int, int]
     """素材尺寸"""
 
@@ -305,6 +307,7 @@ class Video_segment(Visual_segment):
     """
 
     # TODO: material参数接受path进行便捷构造
+    @profiling.timed
     def __init__(self, material: Video_material, target_timerange: Timerange, *,
                  source_timerange: Optional[Timerange] = None, speed: Optional[float] = None, volume: float = 1.0,
                  clip_settings: Optional[Clip_settings] = None):
@@ -334,7 +337,7 @@ class Video_segment(Visual_segment):
 
         super().__init__(material.material_id, source_timerange, target_timerange, speed, volume, clip_settings=clip_settings)
 
-        self.material_instance = deepcopy(material)
+        self.material_instance = material.freeze()  # 各片段共享同一素材实例, 冻结以防被修改
         self.material_size = (material.width, material.height)
         self.effects = []
         self.filters = []
@@ -342,7 +345,7 @@ class Video_segment(Visual_segment):
         self.mask = None
         self.background_filling = None
 
-    def add_animation(self, animation_type: Union[Intro_type, Outro_type, Group_animation_type],
+    def add_animation(self, animation_type: Union["Intro_type", "Outro_type", "Group_animation_type"],
                       duration: Optional[Union[int, str]] = None) -> "Video_segment":
         """将给定的入场/出场/组合动画添加到此片段的动画列表中
 
@@ -353,6 +356,8 @@ class Video_segment(Visual_segment):
         """
         if duration is not None:
             duration = tim(duration)
+
+        from .metadata import Intro_type, Outro_type, Group_animation_type
         if isinstance(animation_type, Intro_type):
             start = 0
             duration = duration or animation_type.value.duration
@@ -373,7 +378,7 @@ class Video_segment(Visual_segment):
 
         return self
 
-    def add_effect(self, effect_type: Union[Video_scene_effect_type, Video_character_effect_type],
+    def add_effect(self, effect_type: Union["Video_scene_effect_type", "Video_character_effect_type"],
                    params: Optional[List[Optional[float]]] = None) -> "Video_segment":
         """为视频片段添加一个作用于整个片段的特效
 
@@ -394,7 +399,7 @@ class Video_segment(Visual_segment):
 
         return self
 
-    def add_filter(self, filter_type: Filter_type, intensity: float = 100.0) -> "Video_segment":
+    def add_filter(self, filter_type: "Filter_type", intensity: float = 100.0) -> "Video_segment":
         """为视频片段添加一个滤镜
 
         Args:
@@ -443,7 +448,7 @@ class Video_segment(Visual_segment):
         self.extra_material_refs.append(self.mask.global_id)
         return self
 
-    def add_transition(self, transition_type: Transition_type, *, duration: Optional[Union[int, str]] = None) -> "Video_segment":
+    def add_transition(self, transition_type: "Transition_type", *, duration: Optional[Union[int, str]] = None) -> "Video_segment":
         """为视频片段添加转场, 注意转场应当添加在**前面的**片段上
 
         Args:
@@ -510,7 +515,7 @@ class Sticker_segment(Visual_segment):
             target_timerange (`Timerange`): 片段在轨道上的目标时间范围
             clip_settings (`Clip_settings`, optional): 图像调节设置, 默认不作任何变换
         """
-        super().__init__(uuid.uuid4().hex, None, target_timerange, 1.0, 1.0, clip_settings=clip_settings)
+        super().__init__(id_util.new_id(), None, target_timerange, 1.0, 1.0, clip_settings=clip_settings)
         self.resource_id = resource_id
 
     def export_material(self) -> Dict[str, Any]:
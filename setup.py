@@ -24,4 +24,8 @@ setup(
         "imageio",
         "uiautomation>=2"
     ],
+    extras_require={
+        "fast": ["orjson"],
+        "numpy": ["numpy"]
+    },
 )